@@ -0,0 +1,149 @@
+import argparse
+import json
+import os
+import signal
+import socketserver
+import sys
+import threading
+import time
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.health_check_agent import HealthCheckAgent
+from agents.multi_env_deploy_agent import MultiEnvDeployAgent
+from core.config_loader import get_all_profiles
+from core.daemon_client import DaemonRequestError, DaemonUnavailable, get_socket_path, send_command
+
+class AgentDaemon:
+    """Resident process that keeps agents and config warm behind a Unix socket.
+
+    Protocol: one JSON object per line, e.g. {"command": "health_check", "env": "dev"},
+    answered by one JSON line with at least an 'ok' field.
+    """
+
+    def __init__(self, socket_path=None):
+        self.socket_path = get_socket_path(socket_path)
+        self.health_agent = HealthCheckAgent()
+        self.deploy_agent = MultiEnvDeployAgent()
+        # Warm image layers so the first staging redeploy does not pay for a pull
+        self.deploy_agent.prepull_images()
+        self.started_at = time.time()
+        self.command_counts = {}
+        self._deploy_lock = threading.Lock()
+        self._server = None
+        self.handlers = {
+            'health_check': self._handle_health_check,
+            'deploy': self._handle_deploy,
+            'status': self._handle_status
+        }
+
+    def handle(self, request):
+        """Dispatch a decoded request to its handler"""
+        command = request.get('command')
+        handler = self.handlers.get(command)
+        if not handler:
+            return {'ok': False, 'error': f"Unknown command: {command}"}
+
+        self.command_counts[command] = self.command_counts.get(command, 0) + 1
+        try:
+            return handler(request)
+        except Exception as e:
+            return {'ok': False, 'error': str(e)}
+
+    def _env(self, request):
+        """The request's env if it names a configured profile, else ValueError"""
+        env_name = request.get('env')
+        environments = get_all_profiles()
+        if env_name not in environments:
+            raise ValueError(f"Missing or unknown env: {env_name!r} "
+                             f"(expected one of {', '.join(sorted(environments))})")
+        return env_name
+
+    def _handle_health_check(self, request):
+        env_name = self._env(request)
+        result = self.health_agent.check_once(env_name)
+        return {'ok': True, 'env': env_name, 'result': result}
+
+    def _handle_deploy(self, request):
+        env_name = self._env(request)
+        # Deploys rewrite shared files, so run them one at a time
+        with self._deploy_lock:
+            success = self.deploy_agent.deploy(env_name)
+        return {'ok': True, 'env': env_name, 'success': success}
+
+    def _handle_status(self, request):
+        return {
+            'ok': True,
+            'pid': os.getpid(),
+            'uptime_s': round(time.time() - self.started_at, 1),
+            'environments': sorted(get_all_profiles().keys()),
+            'commands': self.command_counts
+        }
+
+    def serve_forever(self):
+        """Bind the control socket and serve requests until interrupted"""
+        self._remove_stale_socket()
+        daemon = self
+
+        class RequestHandler(socketserver.StreamRequestHandler):
+            def handle(self):
+                for line in self.rfile:
+                    if not line.strip():
+                        continue
+                    try:
+                        reply = daemon.handle(json.loads(line))
+                    except ValueError as e:
+                        reply = {'ok': False, 'error': f"Invalid request: {e}"}
+                    self.wfile.write((json.dumps(reply) + "\n").encode())
+                    self.wfile.flush()
+
+        self._server = socketserver.ThreadingUnixStreamServer(self.socket_path, RequestHandler)
+        self._server.daemon_threads = True
+        print(f"Agent daemon listening on {self.socket_path} (pid {os.getpid()})")
+
+        try:
+            self._server.serve_forever()
+        except KeyboardInterrupt:
+            print("\nAgent daemon stopped")
+        finally:
+            self._server.server_close()
+            if os.path.exists(self.socket_path):
+                os.unlink(self.socket_path)
+
+    def shutdown(self):
+        if self._server:
+            self._server.shutdown()
+
+    def _remove_stale_socket(self):
+        if not os.path.exists(self.socket_path):
+            return
+        try:
+            send_command('status', socket_path=self.socket_path, timeout=1)
+        except DaemonUnavailable:
+            os.unlink(self.socket_path)
+            return
+        except DaemonRequestError:
+            pass  # something is listening, just slow to answer
+        raise RuntimeError(f"Agent daemon already running on {self.socket_path}")
+
+def main():
+    parser = argparse.ArgumentParser(description='Resident agent daemon with a local control socket')
+    parser.add_argument('--socket', help='Unix socket path (default: $AGENT_DAEMON_SOCKET or logs/agent_daemon.sock)')
+    parser.add_argument('--status', action='store_true',
+                       help='Query a running daemon instead of starting one')
+
+    args = parser.parse_args()
+
+    if args.status:
+        try:
+            print(json.dumps(send_command('status', socket_path=args.socket, timeout=5), indent=2))
+        except (DaemonUnavailable, DaemonRequestError) as e:
+            print(e)
+            sys.exit(1)
+        return
+
+    os.makedirs("logs", exist_ok=True)
+    # Treat SIGTERM like Ctrl+C so the socket file is removed on shutdown
+    signal.signal(signal.SIGTERM, lambda signum, frame: sys.exit(0))
+    AgentDaemon(args.socket).serve_forever()
+
+if __name__ == "__main__":
+    main()
@@ -3,13 +3,24 @@ import os
 import time
 from datetime import datetime
 from .deploy_agent import DeployAgent
+from .remediation_controller import RemediationController
 
 class AutoFixAgent:
-    def __init__(self, check_interval=60):
+    def __init__(self, check_interval=60, env='local', controller=None, state=None, url=None,
+                 verify_outcomes=False):
         self.check_interval = check_interval
+        self.env = env
+        # The service this agent redeploys; incidents for other targets are not ours to fix
+        self.url = (url or os.getenv('AUTOFIX_URL', 'http://127.0.0.1:5000')).rstrip('/')
         self.issue_log = "logs/issue_log.csv"
         self.healing_log = "logs/healing_log.csv"
         self.deploy_agent = DeployAgent()
+        self.controller = controller or RemediationController()
+        self.state = state
+        # When set, the caller verifies recovery and reports it via controller.record()
+        self.verify_outcomes = verify_outcomes
+        self._last_handled = None
+        self.last_issue = None
         self._init_log()
     
     def _init_log(self):
@@ -19,7 +30,11 @@ class AutoFixAgent:
                 writer = csv.writer(f)
                 writer.writerow(['timestamp', 'issue_type', 'action', 'status'])
     
-    def check_issues(self):
+    def check_issues(self, auto_handle=True):
+        """Return True for a new issue; with auto_handle, also remediate it via the static action map"""
+        if self.state is not None:
+            return self._check_shared_state(auto_handle)
+        
         if not os.path.exists(self.issue_log):
             return False
         
@@ -27,11 +42,53 @@ class AutoFixAgent:
             reader = csv.DictReader(f)
             issues = list(reader)
         
+        issues = [issue for issue in issues if self.handles(issue)]
         if len(issues) > 0:
             latest_issue = issues[-1]
+            # Each issue is remediated once; a persisting problem raises a new one
+            if self._last_handled is not None and latest_issue.get('timestamp', '') <= self._last_handled:
+                return False
+            self._last_handled = latest_issue.get('timestamp')
+            self.last_issue = latest_issue
+            if not auto_handle:
+                return True
             return self._handle_issue(latest_issue)
         return False
     
+    def _check_shared_state(self, auto_handle):
+        """Same as check_issues, but reads the latest incident for our target from SharedState"""
+        latest_issue = self.state.snapshot()['last_incident']
+        if latest_issue is not None and not self.handles(latest_issue):
+            latest_issue = next((incident for incident in reversed(self.state.incidents.items())
+                                 if self.handles(incident)), None)
+        if latest_issue is None or latest_issue['seq'] <= (self._last_handled or 0):
+            return False
+        self._last_handled = latest_issue['seq']
+        self.last_issue = latest_issue
+        if not auto_handle:
+            return True
+        return self._handle_issue(latest_issue)
+    
+    def mark_handled(self, until):
+        """Treat every incident raised up to `until` (epoch seconds) as handled.
+
+        Called once a fix is verified: incidents the monitor kept raising while
+        the service was still recovering must not trigger another redeploy.
+        """
+        if self.state is None:
+            until_iso = datetime.fromtimestamp(until).isoformat()
+            self._last_handled = max(self._last_handled or '', until_iso)
+            return
+        seqs = [incident['seq'] for incident in self.state.incidents.items()
+                if self.handles(incident) and incident['timestamp'] <= until]
+        if seqs:
+            self._last_handled = max(self._last_handled or 0, max(seqs))
+    
+    def handles(self, incident):
+        """True for incidents on this agent's service (untargeted ones come from its own monitor)"""
+        target = incident.get('target')
+        return not target or target.rstrip('/') == self.url
+    
     def _handle_issue(self, issue):
         alert_type = issue['alert_type']
         
@@ -48,7 +105,10 @@ class AutoFixAgent:
     
     def _restart_deployment(self):
         try:
-            self.deploy_agent.deploy_flask()
+            if self.controller.run(self.env, 'restart', self.deploy_agent.deploy_flask,
+                                   deferred=self.verify_outcomes) is None:
+                self._log_skipped('CONNECTION_FAILED', 'restart')
+                return None
             self._log_healing('CONNECTION_FAILED', 'restart', 'success')
             print("AUTO-FIX: Restarted deployment")
             return True
@@ -59,7 +119,10 @@ class AutoFixAgent:
     def _rollback_deployment(self):
         try:
             # Simple rollback - redeploy basic version
-            self.deploy_agent.deploy_flask()
+            if self.controller.run(self.env, 'rollback', self.deploy_agent.deploy_flask,
+                                   deferred=self.verify_outcomes) is None:
+                self._log_skipped('SLOW_RESPONSE', 'rollback')
+                return None
             self._log_healing('SLOW_RESPONSE', 'rollback', 'success')
             print("AUTO-FIX: Rolled back deployment")
             return True
@@ -67,6 +130,10 @@ class AutoFixAgent:
             self._log_healing('SLOW_RESPONSE', 'rollback', f'failed: {str(e)}')
             return False
     
+    def _log_skipped(self, issue_type, action):
+        reason = self.controller.last_skip_reason.get(self.env, 'suppressed')
+        self._log_healing(issue_type, action, f'skipped: {reason}')
+    
     def _log_healing(self, issue_type, action, status):
         with open(self.healing_log, 'a', newline='') as f:
             writer = csv.writer(f)
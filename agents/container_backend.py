@@ -0,0 +1,246 @@
+import csv
+import os
+import subprocess
+import sys
+import threading
+import time
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.http_pool import get_session_pool
+
+class DockerCliRuntime:
+    """Container runtime backed by the docker CLI"""
+
+    def _docker(self, *args, check=True):
+        result = subprocess.run(['docker', *args], capture_output=True, text=True)
+        if check and result.returncode != 0:
+            raise RuntimeError(f"docker {args[0]} failed: {result.stderr.strip()}")
+        return result
+
+    def pull(self, image):
+        self._docker('pull', '--quiet', image)
+
+    def image_digest(self, image):
+        result = self._docker('image', 'inspect', '--format', '{{.Id}}', image, check=False)
+        return result.stdout.strip() if result.returncode == 0 else None
+
+    def container(self, name):
+        """{'image': image id, 'running': bool} for an existing container, else None"""
+        result = self._docker('container', 'inspect', '--format', '{{.Image}} {{.State.Running}}', name,
+                              check=False)
+        if result.returncode != 0:
+            return None
+        image, running = result.stdout.split()
+        return {'image': image, 'running': running == 'true'}
+
+    def create(self, name, image, port):
+        self._docker('create', '-p', f'{port}:{port}', '--name', name, image)
+
+    def start(self, name):
+        self._docker('start', name)
+
+    def stop(self, name):
+        self._docker('stop', name, check=False)
+
+    def remove(self, name):
+        self._docker('rm', '-f', name, check=False)
+
+    def rename(self, name, new_name):
+        self._docker('rename', name, new_name)
+
+    def health(self, name):
+        """healthy/unhealthy/starting from the image HEALTHCHECK, else running/exited"""
+        result = self._docker('container', 'inspect', '--format',
+                              '{{if .State.Health}}{{.State.Health.Status}}{{else}}{{.State.Status}}{{end}}',
+                              name, check=False)
+        return result.stdout.strip() if result.returncode == 0 else 'missing'
+
+class FakeRuntime:
+    """In-memory runtime with configurable delays, for tests and local dry runs"""
+
+    def __init__(self, pull_delay=0.0, start_delay=0.0, healthy=True):
+        self.pull_delay = pull_delay
+        self.start_delay = start_delay
+        self.healthy = healthy
+        self.images = {}
+        self.containers = {}
+        self.calls = []
+
+    def pull(self, image):
+        self.calls.append(('pull', image))
+        time.sleep(self.pull_delay)
+        self.images.setdefault(image, f"sha256:{abs(hash(image)):x}")
+
+    def image_digest(self, image):
+        return self.images.get(image)
+
+    def container(self, name):
+        container = self.containers.get(name)
+        return dict(container) if container else None
+
+    def create(self, name, image, port):
+        self.calls.append(('create', name))
+        self.containers[name] = {'image': self.images[image], 'running': False, 'started_at': None}
+
+    def start(self, name):
+        self.calls.append(('start', name))
+        self.containers[name].update(running=True, started_at=time.monotonic())
+
+    def stop(self, name):
+        if name in self.containers:
+            self.containers[name]['running'] = False
+
+    def remove(self, name):
+        self.containers.pop(name, None)
+
+    def rename(self, name, new_name):
+        self.containers[new_name] = self.containers.pop(name)
+
+    def health(self, name):
+        container = self.containers.get(name)
+        if not container or not container['running']:
+            return 'exited'
+        if time.monotonic() - container['started_at'] < self.start_delay:
+            return 'starting'
+        return 'healthy' if self.healthy else 'unhealthy'
+
+RUNTIMES = {
+    'docker': DockerCliRuntime,
+    'fake': FakeRuntime
+}
+
+class ContainerBackend:
+    """Fast, health-gated container (re)deploys.
+
+    - Reuses the running container when its image digest is unchanged
+    - Uses a recent background pre-pull instead of pulling inline, and the
+      local image when the registry cannot be reached
+    - Creates the replacement while the old container keeps serving, then
+      swaps and waits for readiness, restarting the old one if it fails to
+      start or never becomes ready
+    Pull, create and ready timings go to logs/container_timings.csv.
+    """
+
+    def __init__(self, runtime=None, ready_timeout=60, prepull_max_age=300):
+        self.runtime = runtime or DockerCliRuntime()
+        self.ready_timeout = ready_timeout
+        self.prepull_max_age = prepull_max_age
+        self.timings_log = "logs/container_timings.csv"
+        self._prepulls = {}
+        self._lock = threading.Lock()
+        self._init_log()
+
+    def _init_log(self):
+        os.makedirs("logs", exist_ok=True)
+        if not os.path.exists(self.timings_log):
+            with open(self.timings_log, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['timestamp', 'container', 'image', 'outcome', 'pull_s', 'create_s',
+                                 'ready_s', 'total_s'])
+
+    def prepull(self, image):
+        """Start pulling image in the background; deploy() picks up the result"""
+        with self._lock:
+            entry = self._prepulls.get(image)
+            if entry and not entry['done'].is_set():
+                return
+            entry = {'done': threading.Event(), 'finished_at': None, 'error': None}
+            self._prepulls[image] = entry
+
+        def pull():
+            try:
+                self.runtime.pull(image)
+            except Exception as e:
+                entry['error'] = e
+            entry['finished_at'] = time.monotonic()
+            entry['done'].set()
+
+        threading.Thread(target=pull, name=f'prepull-{image}', daemon=True).start()
+
+    def deploy(self, name, image, port, health_url=None):
+        """Deploy image as container `name`; returns (success, details)"""
+        started = time.monotonic()
+        timings = {'pull_s': 0.0, 'create_s': 0.0, 'ready_s': 0.0}
+        try:
+            timings['pull_s'] = self._pull(image)
+        except Exception as e:
+            # Registry unreachable: carry on with the local copy of the image, if any
+            if self.runtime.image_digest(image) is None:
+                raise
+            print(f"Pull of {image} failed ({e}); using the local image")
+
+        digest = self.runtime.image_digest(image)
+        current = self.runtime.container(name)
+        if current and current['running'] and current['image'] == digest:
+            self._log_timings(name, image, 'reused', timings, started)
+            return True, f"Container {name} already running {image} ({digest[:19]})"
+
+        candidate = f"{name}_next"
+        self.runtime.remove(candidate)
+        step = time.monotonic()
+        self.runtime.create(candidate, image, port)
+        timings['create_s'] = time.monotonic() - step
+
+        # The host port is shared, so the old container stops only once the new one exists
+        if current:
+            self.runtime.stop(name)
+        step = time.monotonic()
+        try:
+            self.runtime.start(candidate)
+            ready = self._wait_ready(candidate, health_url)
+            error = None
+        except Exception as e:
+            ready, error = False, e
+        timings['ready_s'] = time.monotonic() - step
+
+        if not ready:
+            self.runtime.remove(candidate)
+            if current:
+                self.runtime.start(name)
+            self._log_timings(name, image, 'rolled_back', timings, started)
+            reason = f"failed to start: {error}" if error else "never became ready"
+            return False, f"Container for {image} {reason}; kept {name}"
+
+        self.runtime.remove(name)
+        self.runtime.rename(candidate, name)
+        self._log_timings(name, image, 'replaced' if current else 'created', timings, started)
+        return True, f"Docker container started: {image} on port {port}"
+
+    def _pull(self, image):
+        """Seconds spent waiting for the image (0 when a fresh pre-pull is reused)"""
+        start = time.monotonic()
+        entry = self._prepulls.get(image)
+        if entry:
+            entry['done'].wait()
+            fresh = time.monotonic() - entry['finished_at'] <= self.prepull_max_age
+            if fresh and entry['error'] is None:
+                return round(time.monotonic() - start, 3)
+        self.runtime.pull(image)
+        return round(time.monotonic() - start, 3)
+
+    def _wait_ready(self, name, health_url):
+        deadline = time.monotonic() + self.ready_timeout
+        while time.monotonic() < deadline:
+            status = self.runtime.health(name)
+            if status == 'healthy':
+                return True
+            if status in ('unhealthy', 'exited', 'dead', 'missing'):
+                return False
+            if status == 'running' and (not health_url or self._http_ready(health_url)):
+                return True
+            time.sleep(0.5)
+        return False
+
+    def _http_ready(self, url):
+        try:
+            response, _ = get_session_pool().get(url, timeout=2)
+            return 200 <= response.status_code < 300
+        except Exception:
+            return False
+
+    def _log_timings(self, name, image, outcome, timings, started):
+        with open(self.timings_log, 'a', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([datetime.now().isoformat(), name, image, outcome,
+                             f"{timings['pull_s']:.3f}", f"{timings['create_s']:.3f}",
+                             f"{timings['ready_s']:.3f}", f"{time.monotonic() - started:.3f}"])
@@ -22,6 +22,10 @@ app = Flask(__name__)
 def hello():
     return "{message}"
 
+@app.route('/health')
+def health():
+    return "OK"
+
 if __name__ == '__main__':
     app.run(debug={debug}, port={port})'''
         
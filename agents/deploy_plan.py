@@ -0,0 +1,195 @@
+import argparse
+import csv
+import json
+import os
+import sys
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from agents.multi_env_deploy_agent import MultiEnvDeployAgent
+
+PLAN_FILE = os.path.join("config", "deploy_plan.json")
+STATE_FILE = os.path.join("logs", "deploy_plan_state.json")
+
+class DeployPlan:
+    """Dependency-aware deployment of services across environments.
+
+    Nodes declare an environment, an optional service label and the nodes
+    they depend on. Ready nodes run in parallel (up to max_workers); a
+    failed node skips everything downstream of it, and a retry re-runs only
+    the failed and skipped nodes from the previous run.
+    """
+
+    def __init__(self, nodes, max_workers=2, deploy_fn=None):
+        self.nodes = nodes
+        self.max_workers = max_workers
+        self.deploy_fn = deploy_fn or MultiEnvDeployAgent().deploy
+        self.plan_log = "logs/deploy_plan_log.csv"
+        self.dependents = {name: [] for name in nodes}
+        for name, node in nodes.items():
+            for dependency in node.get('depends_on', []):
+                if dependency not in nodes:
+                    raise ValueError(f"Node '{name}' depends on unknown node '{dependency}'")
+                self.dependents[dependency].append(name)
+        self.order = self.topological_order()
+        self._init_log()
+
+    @classmethod
+    def load(cls, path=PLAN_FILE, **kwargs):
+        with open(path, 'r') as f:
+            plan = json.load(f)
+        kwargs.setdefault('max_workers', plan.get('max_workers', 2))
+        return cls(plan['nodes'], **kwargs)
+
+    def _init_log(self):
+        os.makedirs("logs", exist_ok=True)
+        if not os.path.exists(self.plan_log):
+            with open(self.plan_log, 'w', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(['timestamp', 'node', 'env', 'status', 'duration_s'])
+
+    def topological_order(self):
+        """Kahn's algorithm; raises ValueError on a dependency cycle"""
+        indegree = {name: len(node.get('depends_on', [])) for name, node in self.nodes.items()}
+        ready = [name for name, degree in indegree.items() if degree == 0]
+        order = []
+
+        while ready:
+            name = ready.pop(0)
+            order.append(name)
+            for dependent in self.dependents[name]:
+                indegree[dependent] -= 1
+                if indegree[dependent] == 0:
+                    ready.append(dependent)
+
+        if len(order) != len(self.nodes):
+            cycle = sorted(set(self.nodes) - set(order))
+            raise ValueError(f"Dependency cycle between nodes: {', '.join(cycle)}")
+        return order
+
+    def run(self, completed=()):
+        """Deploy every node not in `completed`; returns {node: result dict}"""
+        completed = set(completed)
+        results = {name: {'status': 'success', 'duration_s': 0.0, 'reused': True} for name in completed}
+        pending = {name: len([d for d in node.get('depends_on', []) if d not in completed])
+                   for name, node in self.nodes.items() if name not in completed}
+        started = time.monotonic()
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            running = {}
+
+            def submit_ready():
+                for name in [n for n, degree in pending.items() if degree == 0 and n not in results]:
+                    results[name] = {'status': 'running'}
+                    running[executor.submit(self._deploy_node, name)] = name
+
+            submit_ready()
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = running.pop(future)
+                    results[name] = future.result()
+                    if results[name]['status'] == 'success':
+                        for dependent in self.dependents[name]:
+                            pending[dependent] -= 1
+                    else:
+                        self._skip_downstream(name, results)
+                submit_ready()
+
+        self.wall_time_s = round(time.monotonic() - started, 2)
+        return results
+
+    def _deploy_node(self, name):
+        node = self.nodes[name]
+        print(f"[plan] {name}: deploying {node.get('service', 'app')} to {node['env']}")
+        start = time.monotonic()
+        try:
+            success = bool(self.deploy_fn(node['env']))
+        except Exception as e:
+            print(f"[plan] {name}: {e}")
+            success = False
+        duration = round(time.monotonic() - start, 2)
+
+        status = 'success' if success else 'failed'
+        self._log_node(name, node['env'], status, duration)
+        return {'status': status, 'duration_s': duration}
+
+    def _skip_downstream(self, name, results):
+        for dependent in self.dependents[name]:
+            if dependent not in results:
+                results[dependent] = {'status': 'skipped', 'duration_s': 0.0}
+                self._log_node(dependent, self.nodes[dependent]['env'], 'skipped', 0.0)
+                self._skip_downstream(dependent, results)
+
+    def critical_path(self, results):
+        """(path, seconds) of the longest dependency chain by measured duration"""
+        finish = {}
+        previous = {}
+        for name in self.order:
+            duration = results.get(name, {}).get('duration_s', 0.0)
+            best = max(self.nodes[name].get('depends_on', []), key=lambda d: finish[d], default=None)
+            finish[name] = duration + (finish[best] if best else 0.0)
+            previous[name] = best
+
+        if not finish:
+            return [], 0.0
+        node = max(finish, key=finish.get)
+        path = []
+        while node:
+            path.append(node)
+            node = previous[node]
+        return list(reversed(path)), round(finish[path[0]], 2)
+
+    def _log_node(self, name, env, status, duration):
+        with open(self.plan_log, 'a', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([datetime.now().isoformat(), name, env, status, duration])
+
+def save_state(results, path=STATE_FILE):
+    with open(path, 'w') as f:
+        json.dump({'timestamp': datetime.now().isoformat(), 'results': results}, f, indent=2)
+
+def load_completed(path=STATE_FILE):
+    """Nodes that succeeded in the previous run"""
+    if not os.path.exists(path):
+        return set()
+    with open(path, 'r') as f:
+        results = json.load(f).get('results', {})
+    return {name for name, result in results.items() if result.get('status') == 'success'}
+
+def main():
+    parser = argparse.ArgumentParser(description='Run a dependency-ordered, parallel deployment plan')
+    parser.add_argument('--plan', default=PLAN_FILE, help='Plan file (default: config/deploy_plan.json)')
+    parser.add_argument('--workers', type=int, help='Maximum parallel deployments')
+    parser.add_argument('--retry', action='store_true',
+                       help='Re-run only the nodes that failed or were skipped last time')
+    parser.add_argument('--dry-run', action='store_true', help='Print the schedule without deploying')
+
+    args = parser.parse_args()
+
+    kwargs = {'max_workers': args.workers} if args.workers else {}
+    if args.dry_run:
+        kwargs['deploy_fn'] = lambda env: True
+    plan = DeployPlan.load(args.plan, **kwargs)
+    print(f"Schedule: {' -> '.join(plan.order)} (max {plan.max_workers} in parallel)")
+    if args.dry_run:
+        return
+
+    completed = load_completed() if args.retry else set()
+    results = plan.run(completed)
+    save_state(results)
+
+    path, path_time = plan.critical_path(results)
+    total = sum(result['duration_s'] for result in results.values())
+    for name in plan.order:
+        print(f"  {name:<20} {results[name]['status']:<8} {results[name]['duration_s']:.2f}s")
+    print(f"Wall time {plan.wall_time_s:.2f}s, critical path {path_time:.2f}s "
+          f"({' -> '.join(path)}), sum of deploys {total:.2f}s")
+
+    if any(result['status'] != 'success' for result in results.values()):
+        print("Plan incomplete; re-run with --retry to resume from the failed nodes")
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
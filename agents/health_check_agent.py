@@ -1,5 +1,4 @@
 import argparse
-import requests
 import csv
 import os
 import time
@@ -7,6 +6,10 @@ import sys
 from datetime import datetime
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 from core.config_loader import get_env_profile
+from core.csv_log import ensure_csv_header
+from core.health_records import HealthRecordWriter
+from core.probes import ProbeRecord, build_check
+from core.daemon_client import DaemonRequestError, DaemonUnavailable, daemon_available, send_command
 
 class HealthCheckAgent:
     def __init__(self):
@@ -15,16 +18,23 @@ class HealthCheckAgent:
             'staging': 'logs/health_staging.csv', 
             'cloud': 'logs/health_cloud.csv'
         }
+        # csv (default), binary (compact logs/health_<env>.bin records) or both
+        self.log_format = os.getenv('HEALTH_LOG_FORMAT', 'csv')
+        if self.log_format == 'binary':
+            print("Warning: HEALTH_LOG_FORMAT=binary writes no health CSV rows; the dashboard and "
+                  "log_query will not see these checks (use 'both' alongside the dashboard)")
+        self.record_writers = {}
         self._init_logs()
     
     def _init_logs(self):
         os.makedirs("logs", exist_ok=True)
         
         for env, log_file in self.health_logs.items():
-            if not os.path.exists(log_file):
-                with open(log_file, 'w', newline='') as f:
-                    writer = csv.writer(f)
-                    writer.writerow(['timestamp', 'env', 'status', 'http_code', 'response_time_ms'])
+            ensure_csv_header(log_file, ['timestamp', 'env', 'status', 'http_code', 'response_time_ms',
+                                         'connect_ms', 'ttfb_ms', 'dns_ms', 'tls_ms', 'transfer_ms',
+                                         'failed_step'])
+            if self.log_format in ('binary', 'both'):
+                self.record_writers[env] = HealthRecordWriter(os.path.splitext(log_file)[0] + '.bin')
     
     def check_health(self, env_name, once=False):
         """Perform health check for specified environment"""
@@ -40,13 +50,17 @@ class HealthCheckAgent:
             print(f"Error checking {env_name}: {e}")
             return False
     
-    def _single_check(self, env_name, profile):
-        """Perform single health check"""
+    def check_once(self, env_name, profile=None):
+        """Perform and log a single health check, returning the result dict"""
+        profile = profile or get_env_profile(env_name)
         result = self._perform_check(env_name, profile)
         self._log_health(env_name, result)
-        
-        status_msg = "UP" if result['status'] == 'UP' else "DOWN"
-        print(f"Health check {env_name}: {status_msg} (HTTP {result['http_code']}, {result['response_time_ms']}ms)")
+        return result
+    
+    def _single_check(self, env_name, profile):
+        """Perform single health check"""
+        result = self.check_once(env_name, profile)
+        _print_single_result(env_name, result)
         
         return result['status'] == 'UP'
     
@@ -68,67 +82,29 @@ class HealthCheckAgent:
             return True
     
     def _perform_check(self, env_name, profile):
-        """Perform actual health check based on environment type"""
-        if profile['type'] == 'local':
-            return self._check_local(env_name, profile)
-        elif profile['type'] == 'docker':
-            return self._check_docker(env_name, profile)
-        elif profile['type'] == 'render':
-            return self._check_cloud(env_name, profile)
-        else:
-            return {
-                'status': 'DOWN',
-                'http_code': 0,
-                'response_time_ms': 0
-            }
-    
-    def _check_local(self, env_name, profile):
-        """Check local environment health"""
-        url = f"http://{profile['host']}:{profile['port']}"
-        return self._http_check(url)
-    
-    def _check_docker(self, env_name, profile):
-        """Check Docker environment health"""
-        url = f"http://localhost:{profile['port']}"
-        return self._http_check(url)
-    
-    def _check_cloud(self, env_name, profile):
-        """Simulate cloud environment health check"""
-        # Simulate cloud API check
-        import random
-        
-        # Simulate response time and status
-        response_time = random.randint(100, 500)
-        is_up = random.choice([True, True, True, False])  # 75% uptime
+        """Perform actual health check based on environment type and check spec"""
+        if profile['type'] not in ('local', 'docker', 'render'):
+            return ProbeRecord('DOWN', 0).as_result()
         
-        return {
-            'status': 'UP' if is_up else 'DOWN',
-            'http_code': 200 if is_up else 503,
-            'response_time_ms': response_time
-        }
+        check = build_check(profile.get('check'), self._base_url(profile))
+        return check.run().as_result()
     
-    def _http_check(self, url):
-        """Perform HTTP health check"""
-        try:
-            start_time = time.time()
-            response = requests.get(url, timeout=10)
-            response_time = int((time.time() - start_time) * 1000)
-            
-            return {
-                'status': 'UP' if 200 <= response.status_code < 300 else 'DOWN',
-                'http_code': response.status_code,
-                'response_time_ms': response_time
-            }
-            
-        except requests.exceptions.RequestException:
-            return {
-                'status': 'DOWN',
-                'http_code': 0,
-                'response_time_ms': 0
-            }
+    def _base_url(self, profile):
+        """URL probed for an environment, None if it has no reachable endpoint"""
+        if profile['type'] == 'local':
+            return f"http://{profile['host']}:{profile['port']}"
+        elif profile['type'] == 'docker':
+            return f"http://localhost:{profile['port']}"
+        # Cloud (Render) targets are only probed over HTTP once a URL is configured
+        return profile.get('url')
     
     def _log_health(self, env_name, result):
         """Log health check result"""
+        if env_name in self.record_writers:
+            self.record_writers[env_name].append(result)
+            if self.log_format == 'binary':
+                return
+        
         log_file = self.health_logs[env_name]
         
         with open(log_file, 'a', newline='') as f:
@@ -138,18 +114,56 @@ class HealthCheckAgent:
                 env_name,
                 result['status'],
                 result['http_code'],
-                result['response_time_ms']
+                result['response_time_ms'],
+                result.get('connect_ms', 0),
+                result.get('ttfb_ms', 0),
+                result.get('dns_ms', 0),
+                result.get('tls_ms', 0),
+                result.get('transfer_ms', 0),
+                result.get('failed_step', '')
             ])
 
+def _print_single_result(env_name, result):
+    status_msg = "UP" if result['status'] == 'UP' else "DOWN"
+    print(f"Health check {env_name}: {status_msg} (HTTP {result['http_code']}, {result['response_time_ms']}ms)")
+
+def _check_via_daemon(env_name):
+    """Run a single check through the agent daemon; None if it is not reachable"""
+    if not daemon_available():
+        return None
+    try:
+        reply = send_command('health_check', env=env_name)
+    except DaemonUnavailable:
+        return None
+    except DaemonRequestError as e:
+        print(f"Error checking {env_name}: {e}")
+        return False
+    
+    if not reply.get('ok'):
+        print(f"Error checking {env_name}: {reply.get('error')}")
+        return False
+    
+    _print_single_result(env_name, reply['result'])
+    return reply['result']['status'] == 'UP'
+
 def main():
     parser = argparse.ArgumentParser(description='Health check agent for multi-environment monitoring')
     parser.add_argument('--env', required=True, choices=['dev', 'staging', 'cloud'],
                        help='Environment to check')
     parser.add_argument('--once', action='store_true',
                        help='Run single check instead of continuous monitoring')
+    parser.add_argument('--no-daemon', action='store_true',
+                       help='Run in-process even if the agent daemon is running')
     
     args = parser.parse_args()
     
+    if args.once and not args.no_daemon:
+        success = _check_via_daemon(args.env)
+        if success is not None:
+            if not success:
+                sys.exit(1)
+            return
+    
     agent = HealthCheckAgent()
     success = agent.check_health(args.env, args.once)
     
@@ -1,43 +1,46 @@
-import requests
 import time
 import csv
 import os
+import sys
 from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.csv_log import ensure_csv_header
+from core.http_pool import get_session_pool
 
 class MonitorAgent:
-    def __init__(self, url="http://127.0.0.1:5000", timeout=10, slow_threshold=5, ping_interval=30):
+    def __init__(self, url="http://127.0.0.1:5000", timeout=10, slow_threshold=5, ping_interval=30,
+                 state=None, writer=None):
         self.url = url
         self.timeout = timeout
         self.slow_threshold = slow_threshold
         self.ping_interval = ping_interval
         self.monitor_log = "logs/monitor_log.csv"
         self.issue_log = "logs/issue_log.csv"
+        # Optional SharedState to publish into and AsyncCsvWriter to persist through
+        self.state = state
+        self.writer = writer
         self._init_logs()
     
     def _init_logs(self):
         os.makedirs("logs", exist_ok=True)
-        if not os.path.exists(self.monitor_log):
-            with open(self.monitor_log, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp', 'response_time', 'status', 'error'])
-        
-        if not os.path.exists(self.issue_log):
-            with open(self.issue_log, 'w', newline='') as f:
-                writer = csv.writer(f)
-                writer.writerow(['timestamp', 'alert_type', 'message'])
+        # target tells the URLs apart when several monitors share these logs
+        ensure_csv_header(self.monitor_log, ['timestamp', 'response_time', 'status', 'error', 'connect_time',
+                                             'target'])
+        ensure_csv_header(self.issue_log, ['timestamp', 'alert_type', 'message', 'target'])
     
     def ping_app(self):
         try:
-            start_time = time.time()
-            response = requests.get(self.url, timeout=self.timeout)
-            response_time = time.time() - start_time
+            response, timing = get_session_pool().get(self.url, timeout=self.timeout)
+            # App latency only: connection setup is recorded separately
+            response_time = (timing['ttfb_ms'] + timing['transfer_ms']) / 1000
+            connect_time = (timing['dns_ms'] + timing['connect_ms'] + timing['tls_ms']) / 1000
             
             if response_time > self.slow_threshold:
-                self._log_error(response_time, "slow_response", f"Response time: {response_time:.2f}s")
+                self._log_error(response_time, "slow_response", f"Response time: {response_time:.2f}s", connect_time)
                 self._send_alert("SLOW_RESPONSE", f"App responding slowly: {response_time:.2f}s")
                 return False
             
-            self._log_success(response_time)
+            self._log_success(response_time, connect_time)
             return True
             
         except Exception as e:
@@ -45,23 +48,34 @@ class MonitorAgent:
             self._send_alert("CONNECTION_FAILED", f"App unreachable: {str(e)}")
             return False
     
-    def _log_success(self, response_time):
-        with open(self.monitor_log, 'a', newline='') as f:
-            writer = csv.writer(f)
-            writer.writerow([datetime.now().isoformat(), f"{response_time:.2f}", "success", ""])
+    def _log_success(self, response_time, connect_time=0):
+        self._publish_sample(response_time, "success", connect_time)
+        self._append(self.monitor_log, [datetime.now().isoformat(), f"{response_time:.2f}", "success", "", f"{connect_time:.3f}", self.url])
     
-    def _log_error(self, response_time, status, error):
-        with open(self.monitor_log, 'a', newline='') as f:
-            writer = csv.writer(f)
-            # Truncate long error messages
-            short_error = error[:100] + "..." if len(error) > 100 else error
-            writer.writerow([datetime.now().isoformat(), f"{response_time:.2f}", status, short_error])
+    def _log_error(self, response_time, status, error, connect_time=0):
+        self._publish_sample(response_time, status, connect_time)
+        # Truncate long error messages
+        short_error = error[:100] + "..." if len(error) > 100 else error
+        self._append(self.monitor_log, [datetime.now().isoformat(), f"{response_time:.2f}", status, short_error, f"{connect_time:.3f}", self.url])
     
     def _send_alert(self, alert_type, message):
         print(f"ALERT [{alert_type}]: {message}")
-        with open(self.issue_log, 'a', newline='') as f:
+        if self.state is not None:
+            self.state.publish_incident(alert_type, message)
+        self._append(self.issue_log, [datetime.now().isoformat(), alert_type, message, self.url])
+    
+    def _publish_sample(self, response_time, status, connect_time):
+        if self.state is not None:
+            self.state.publish_sample({'timestamp': time.time(), 'response_time': response_time,
+                                       'status': status, 'connect_time': connect_time})
+    
+    def _append(self, log_file, row):
+        if self.writer is not None:
+            self.writer.write(log_file, row)
+            return
+        with open(log_file, 'a', newline='') as f:
             writer = csv.writer(f)
-            writer.writerow([datetime.now().isoformat(), alert_type, message])
+            writer.writerow(row)
     
     def start_monitoring(self):
         print(f"Starting monitoring of {self.url} (interval: {self.ping_interval}s, threshold: {self.slow_threshold}s)")
@@ -7,12 +7,15 @@ from datetime import datetime
 import sys
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-from core.config_loader import get_env_profile
+from core.config_loader import get_env_profile, get_all_profiles
+from core.daemon_client import DaemonRequestError, DaemonUnavailable, daemon_available, send_command
+from agents.container_backend import RUNTIMES, ContainerBackend
 
 class MultiEnvDeployAgent:
     def __init__(self):
         self.deployment_log = "logs/deployment_log.csv"
         self.cloud_attempts_log = "logs/deploy_cloud_attempts.csv"
+        self.container_backends = {}
         self._init_logs()
     
     def _init_logs(self):
@@ -82,26 +85,38 @@ class MultiEnvDeployAgent:
         try:
             image = profile['image']
             port = profile['port']
+            check = profile.get('check')
+            check_path = check.get('path', '/') if isinstance(check, dict) else '/'
             
-            # Build Docker image (simulate)
-            print(f"Building Docker image: {image}")
+            print(f"Deploying Docker image: {image}")
+            backend = self._container_backend(profile)
+            success, details = backend.deploy(f"sampleapp_{env_name}", image, port,
+                                              health_url=f"http://localhost:{port}{check_path}")
             
-            # Run Docker container
-            cmd = f"docker run -d -p {port}:{port} --name sampleapp_{env_name} {image}"
-            print(f"Running: {cmd}")
-            
-            # Simulate docker run (since image might not exist)
-            # In real scenario: result = subprocess.run(cmd.split(), capture_output=True, text=True)
-            
-            details = f"Docker container started: {image} on port {port}"
-            self._log_deployment(env_name, 'deploy', 'success', details)
-            print(f"✅ {details}")
-            return True
+            self._log_deployment(env_name, 'deploy', 'success' if success else 'failed', details)
+            print(f"{'✅' if success else '❌'} {details}")
+            return success
             
         except Exception as e:
             self._log_deployment(env_name, 'deploy', 'failed', str(e))
             return False
     
+    def _container_backend(self, profile):
+        """One backend per runtime type, kept so pre-pulls and state survive between deploys"""
+        runtime = profile.get('runtime', 'docker')
+        if runtime not in self.container_backends:
+            if runtime not in RUNTIMES:
+                raise ValueError(f"Unknown container runtime: {runtime}")
+            self.container_backends[runtime] = ContainerBackend(RUNTIMES[runtime]())
+        return self.container_backends[runtime]
+    
+    def prepull_images(self):
+        """Start background pulls for every Docker environment's image"""
+        for env_name, profile in get_all_profiles().items():
+            if profile.get('type') == 'docker':
+                profile = get_env_profile(env_name)
+                self._container_backend(profile).prepull(profile['image'])
+    
     def _deploy_cloud(self, env_name, profile):
         """Deploy to cloud environment (Render stub)"""
         try:
@@ -143,15 +158,37 @@ class MultiEnvDeployAgent:
                 details
             ])
 
+def _deploy_via_daemon(env_name):
+    """Run a deployment through the agent daemon; None if it is not reachable"""
+    if not daemon_available():
+        return None
+    try:
+        reply = send_command('deploy', env=env_name)
+    except DaemonUnavailable:
+        return None
+    except DaemonRequestError as e:
+        # The daemon may still be deploying; a second in-process deploy would race it
+        print(f"Deployment error: {e}")
+        return False
+    
+    if not reply.get('ok'):
+        print(f"Deployment error: {reply.get('error')}")
+        return False
+    return reply['success']
+
 def main():
     parser = argparse.ArgumentParser(description='Multi-environment deployment agent')
     parser.add_argument('--env', required=True, choices=['dev', 'staging', 'cloud'],
                        help='Environment to deploy to')
+    parser.add_argument('--no-daemon', action='store_true',
+                       help='Run in-process even if the agent daemon is running')
     
     args = parser.parse_args()
     
-    agent = MultiEnvDeployAgent()
-    success = agent.deploy(args.env)
+    success = None if args.no_daemon else _deploy_via_daemon(args.env)
+    if success is None:
+        agent = MultiEnvDeployAgent()
+        success = agent.deploy(args.env)
     
     if success:
         print(f"Deployment to {args.env} completed successfully")
@@ -0,0 +1,138 @@
+import argparse
+import csv
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from datetime import datetime
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from core.csv_log import ensure_csv_header
+from core.http_pool import get_session_pool
+
+class OutcomeVerifier:
+    """Checks whether a remediation actually brought the service back.
+
+    After an action, the URL of the service that raised the incident is
+    probed every `interval` seconds until `required_successes` consecutive
+    fast (under slow_threshold) 2xx responses are seen, or `timeout` seconds
+    pass. Time to recovery is measured from the start of the action, and
+    recovered outcomes carry the wall-clock recovered_at. The reward halves
+    for every `half_life` seconds of recovery time, and is -1 when the
+    service did not recover. Every outcome is appended to logs/mttr_log.csv.
+    Setting stop_event abandons a verification without recording it.
+    """
+
+    def __init__(self, timeout=None, interval=2, required_successes=2, slow_threshold=None,
+                 half_life=None, probe=None, stop_event=None):
+        self.timeout = timeout or int(os.getenv('VERIFY_TIMEOUT', 60))
+        self.interval = interval
+        self.required_successes = required_successes
+        self.slow_threshold = slow_threshold or int(os.getenv('SLOW_THRESHOLD', 5))
+        self.half_life = half_life or float(os.getenv('VERIFY_HALF_LIFE', 30))
+        self.probe = probe or self._probe
+        self.stop_event = stop_event or threading.Event()
+        self.mttr_log = "logs/mttr_log.csv"
+        self._init_log()
+
+    def _init_log(self):
+        os.makedirs("logs", exist_ok=True)
+        ensure_csv_header(self.mttr_log, ['timestamp', 'env', 'action', 'recovered', 'time_to_recovery_s',
+                                          'probes', 'reward', 'target'])
+
+    def verify(self, env, action, url, started_at=None):
+        """Probe url until recovered or timed out; returns an outcome dict including the reward.
+
+        Returns None if stop_event was set before the outcome was known.
+        """
+        started_at = started_at if started_at is not None else time.monotonic()
+        deadline = time.monotonic() + self.timeout
+        probes = streak = 0
+        recovered_at = recovered_wall = None
+
+        while time.monotonic() < deadline:
+            probes += 1
+            if self.probe(url):
+                streak += 1
+                # Recovery starts at the first of the consecutive healthy probes
+                if streak == 1:
+                    recovered_at, recovered_wall = time.monotonic(), time.time()
+                if streak >= self.required_successes:
+                    outcome = self._record(env, action, True, recovered_at - started_at, probes, url)
+                    return dict(outcome, recovered_at=recovered_wall)
+            else:
+                streak = 0
+            if self.stop_event.wait(self.interval):
+                return None
+
+        return self._record(env, action, False, None, probes, url)
+
+    def failed(self, env, action, url=''):
+        """Record an action that errored before there was anything to verify"""
+        return self._record(env, action, False, None, 0, url)
+
+    def reward(self, recovered, time_to_recovery):
+        if not recovered:
+            return -1.0
+        return math.pow(0.5, max(time_to_recovery, 0.0) / self.half_life)
+
+    def _probe(self, url):
+        try:
+            response, timing = get_session_pool().get(url, timeout=self.slow_threshold)
+            response_time = (timing['ttfb_ms'] + timing['transfer_ms']) / 1000
+            return 200 <= response.status_code < 300 and response_time <= self.slow_threshold
+        except Exception:
+            return False
+
+    def _record(self, env, action, recovered, time_to_recovery, probes, url):
+        outcome = {
+            'env': env,
+            'action': action,
+            'recovered': recovered,
+            'time_to_recovery_s': round(time_to_recovery, 2) if recovered else None,
+            'probes': probes,
+            'reward': round(self.reward(recovered, time_to_recovery), 3)
+        }
+        with open(self.mttr_log, 'a', newline='') as f:
+            writer = csv.writer(f)
+            writer.writerow([datetime.now().isoformat(), env, action, recovered,
+                             '' if outcome['time_to_recovery_s'] is None else outcome['time_to_recovery_s'],
+                             probes, outcome['reward'], url])
+        return outcome
+
+def mttr_summary(path="logs/mttr_log.csv"):
+    """{(action, env): {'attempts', 'recovered', 'mttr_s'}} from the MTTR log"""
+    totals = defaultdict(lambda: {'attempts': 0, 'recovered': 0, 'total_s': 0.0})
+    if not os.path.exists(path):
+        return {}
+
+    with open(path, 'r', newline='') as f:
+        for row in csv.DictReader(f):
+            entry = totals[(row['action'], row['env'])]
+            entry['attempts'] += 1
+            if row['recovered'] == 'True':
+                entry['recovered'] += 1
+                entry['total_s'] += float(row['time_to_recovery_s'])
+
+    return {key: {'attempts': entry['attempts'], 'recovered': entry['recovered'],
+                  'mttr_s': round(entry['total_s'] / entry['recovered'], 2) if entry['recovered'] else None}
+            for key, entry in totals.items()}
+
+def main():
+    parser = argparse.ArgumentParser(description='Mean time to recovery per remediation action and environment')
+    parser.add_argument('--log', default="logs/mttr_log.csv", help='MTTR log (default: logs/mttr_log.csv)')
+
+    args = parser.parse_args()
+
+    summary = mttr_summary(args.log)
+    if not summary:
+        print("No verified remediations yet")
+        return
+    print(f"{'action':<20} {'env':<10} {'attempts':>8} {'recovered':>9} {'MTTR':>8}")
+    for (action, env), entry in sorted(summary.items()):
+        mttr = f"{entry['mttr_s']:.2f}s" if entry['mttr_s'] is not None else '-'
+        print(f"{action:<20} {env:<10} {entry['attempts']:>8} {entry['recovered']:>9} {mttr:>8}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,154 @@
+import os
+import threading
+import time
+from collections import deque
+
+class CircuitBreaker:
+    """Stops remediation for an environment after repeated failed fixes.
+
+    closed -> open after failure_threshold consecutive failures; after
+    reset_timeout one trial is let through (half_open) and its outcome
+    either closes the breaker again or re-opens it.
+    """
+
+    def __init__(self, failure_threshold=3, reset_timeout=300):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.state = 'closed'
+        self.failures = 0
+        self.opened_at = 0.0
+
+    def allow(self, now):
+        if self.state == 'open' and now - self.opened_at >= self.reset_timeout:
+            self.state = 'half_open'
+            return True
+        return self.state == 'closed'
+
+    def record_success(self):
+        self.state = 'closed'
+        self.failures = 0
+
+    def record_failure(self, now):
+        self.failures += 1
+        if self.state == 'half_open' or self.failures >= self.failure_threshold:
+            self.state = 'open'
+            self.opened_at = now
+
+class RemediationController:
+    """Guards remediation actions per environment.
+
+    Each call to run() passes through, in order: single-flight (a concurrent
+    request for the same environment waits for and shares the running fix),
+    the circuit breaker, a cooldown/backoff window and a sliding-window limit
+    on redeploys. Suppressed requests return None; the reason is kept in
+    last_skip_reason[env].
+
+    A fix returning only means the redeploy ran. With deferred=True, a
+    successful run counts towards the rate limit and cooldown, but the
+    breaker and backoff wait for record(env, recovered) with the verified
+    outcome.
+    """
+
+    def __init__(self, failure_threshold=None, reset_timeout=None, max_restarts=None,
+                 restart_window=None, cooldown=None, max_backoff=None):
+        self.failure_threshold = failure_threshold or int(os.getenv('REMEDIATION_FAILURE_THRESHOLD', 3))
+        self.reset_timeout = reset_timeout or float(os.getenv('REMEDIATION_RESET_TIMEOUT', 300))
+        self.max_restarts = max_restarts or int(os.getenv('REMEDIATION_MAX_RESTARTS', 3))
+        self.restart_window = restart_window or float(os.getenv('REMEDIATION_RESTART_WINDOW', 600))
+        self.cooldown = cooldown or float(os.getenv('REMEDIATION_COOLDOWN', 30))
+        self.max_backoff = max_backoff or float(os.getenv('REMEDIATION_MAX_BACKOFF', 600))
+
+        self.breakers = {}
+        self.last_skip_reason = {}
+        self._restarts = {}
+        self._next_allowed = {}
+        self._inflight = {}
+        self._lock = threading.Lock()
+
+    def run(self, env, action, fix, deferred=False):
+        """Run fix() for env if allowed; True/False on outcome, None if suppressed.
+
+        Exceptions raised by fix() count as failures and are re-raised.
+        """
+        with self._lock:
+            flight = self._inflight.get(env)
+            if flight is None:
+                reason = self._blocked_reason(env, time.monotonic())
+                if reason:
+                    self.last_skip_reason[env] = reason
+                    print(f"REMEDIATION [{env}]: {action} skipped ({reason})")
+                    return None
+                flight = {'done': threading.Event(), 'result': False}
+                self._inflight[env] = flight
+                owner = True
+            else:
+                owner = False
+
+        if not owner:
+            flight['done'].wait()
+            return flight['result']
+
+        success = False
+        try:
+            success = bool(fix())
+            return success
+        finally:
+            if deferred and success:
+                self._record_attempt(env)
+            else:
+                self._record(env, success)
+            flight['result'] = success
+            with self._lock:
+                del self._inflight[env]
+            flight['done'].set()
+
+    def record(self, env, success):
+        """Feed the verified outcome of a deferred fix into the breaker and backoff"""
+        self._record(env, success, count_restart=False)
+
+    def state(self, env):
+        """Circuit breaker state for env: closed, open or half_open"""
+        breaker = self.breakers.get(env)
+        return breaker.state if breaker else 'closed'
+
+    def _breaker(self, env):
+        if env not in self.breakers:
+            self.breakers[env] = CircuitBreaker(self.failure_threshold, self.reset_timeout)
+        return self.breakers[env]
+
+    def _blocked_reason(self, env, now):
+        if now < self._next_allowed.get(env, 0.0):
+            return f"backing off for {self._next_allowed[env] - now:.1f}s"
+
+        restarts = self._restarts.setdefault(env, deque())
+        while restarts and now - restarts[0] > self.restart_window:
+            restarts.popleft()
+        if len(restarts) >= self.max_restarts:
+            return f"rate limited: {len(restarts)} redeploys in {self.restart_window:.0f}s"
+
+        if not self._breaker(env).allow(now):
+            return "circuit open"
+        return None
+
+    def _record_attempt(self, env):
+        """Count a redeploy whose outcome is not known yet"""
+        now = time.monotonic()
+        with self._lock:
+            self._restarts.setdefault(env, deque()).append(now)
+            self._next_allowed[env] = now + self.cooldown
+
+    def _record(self, env, success, count_restart=True):
+        now = time.monotonic()
+        with self._lock:
+            breaker = self._breaker(env)
+            if count_restart:
+                self._restarts.setdefault(env, deque()).append(now)
+
+            if success:
+                breaker.record_success()
+                delay = self.cooldown
+            else:
+                breaker.record_failure(now)
+                # Exponential backoff on consecutive failures
+                delay = min(self.cooldown * (2 ** breaker.failures), self.max_backoff)
+            self._next_allowed[env] = now + delay
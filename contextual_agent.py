@@ -0,0 +1,156 @@
+import math
+import os
+import time
+from datetime import datetime
+
+import numpy as np
+
+from core.log_query import LogIndex
+from smart_agent import StateActionPolicy
+
+BANDIT_STATE = "bandit_state.npz"
+ALERT_TYPES = ["connection_failed", "slow_response"]
+
+class ContextBuilder:
+    """Turns recent monitor samples and deploy history into a feature vector.
+
+    Features: bias, mean and p95 latency and mean connect time of the samples
+    that got a response, error rate, time since the last deploy to this
+    environment, then one-hot environment and alert type.
+    """
+
+    def __init__(self, state=None, env='local', environments=('local', 'dev', 'staging', 'cloud'),
+                 window=50, deployment_log="logs/deployment_log.csv", target=None):
+        self.state = state
+        self.env = env
+        # Only samples for this URL (or untargeted ones) describe the service being fixed
+        self.target = target.rstrip('/') if target else None
+        self.environments = list(environments)
+        self.window = window
+        self.deployments = LogIndex(deployment_log, ['env'])
+        self.dim = 6 + len(self.environments) + len(ALERT_TYPES)
+
+    def build(self, alert_type):
+        samples = self.state.samples.items() if self.state is not None else []
+        if self.target:
+            samples = [s for s in samples if s.get('target', self.target).rstrip('/') == self.target]
+        samples = samples[-self.window:]
+        # Failed probes are published with zero timings; they would drag latency down mid-outage
+        answered = [s for s in samples if s['status'] != 'connection_failed']
+        latencies = np.array([s['response_time'] for s in answered], dtype=float)
+        connects = np.array([s.get('connect_time', 0.0) for s in answered], dtype=float)
+        errors = np.array([s['status'] != 'success' for s in samples], dtype=float)
+
+        features = np.zeros(self.dim)
+        features[0] = 1.0
+        if len(answered):
+            features[1] = min(latencies.mean() / 10, 1.0)
+            features[2] = min(np.percentile(latencies, 95) / 10, 1.0)
+            features[4] = min(connects.mean(), 1.0)
+        if len(samples):
+            features[3] = errors.mean()
+        features[5] = min(math.log1p(self._minutes_since_deploy()) / 10, 1.0)
+        if self.env in self.environments:
+            features[6 + self.environments.index(self.env)] = 1.0
+        if alert_type in ALERT_TYPES:
+            features[6 + len(self.environments) + ALERT_TYPES.index(alert_type)] = 1.0
+        return features
+
+    def _minutes_since_deploy(self):
+        # Deploys to other environments (multi-env agent, deploy plans) say nothing about this one
+        latest = next(iter(self.deployments.tail(1, env=self.env)), None)
+        if not latest:
+            return 24 * 60.0
+        try:
+            return max((datetime.now() - datetime.fromisoformat(latest['timestamp'])).total_seconds() / 60, 0.0)
+        except ValueError:
+            return 24 * 60.0
+
+class ContextualAgent(StateActionPolicy):
+    """LinUCB contextual bandit with the same choose_action/update interface as SmartAgent.
+
+    Every action keeps a ridge-regression estimate of reward given the
+    context. Exploration comes from the confidence bonus, which shrinks as
+    an action is tried in similar contexts. Converged choices are therefore
+    greedy, not random one time in five. Per-action statistics are stacked
+    arrays, so scoring and updates are vectorized.
+    """
+
+    def __init__(self, context_builder=None, alpha=None, state_file=BANDIT_STATE):
+        super().__init__()
+        self.alpha = alpha if alpha is not None else float(os.getenv('BANDIT_ALPHA', 1.0))
+        self.state_file = state_file
+        self.context_builder = context_builder or ContextBuilder()
+        self.actions = sorted({a for acts in self.state_actions["actions"].values() for a in acts})
+        dim = self.context_builder.dim
+
+        self.A = np.repeat(np.eye(dim)[None, :, :], len(self.actions), axis=0)
+        self.b = np.zeros((len(self.actions), dim))
+        self.pending = {}
+        self.load()
+
+    def load(self):
+        if not os.path.exists(self.state_file):
+            return
+        saved = np.load(self.state_file, allow_pickle=False)
+        saved_actions = list(saved["actions"])
+        if saved["A"].shape[1:] != self.A.shape[1:]:
+            return  # feature layout changed; start fresh
+        for i, action in enumerate(self.actions):
+            if action in saved_actions:
+                j = saved_actions.index(action)
+                self.A[i], self.b[i] = saved["A"][j], saved["b"][j]
+
+    def save(self):
+        try:
+            np.savez(self.state_file, A=self.A, b=self.b, actions=np.array(self.actions))
+        except OSError as e:
+            print(f"Warning: Could not save bandit state: {e}")
+
+    def scores(self, context, actions):
+        """Upper confidence bound for each action in the given context"""
+        idx = [self.actions.index(a) for a in actions]
+        A_inv = np.linalg.inv(self.A[idx])
+        theta = np.einsum('aij,aj->ai', A_inv, self.b[idx])
+        bonus = np.sqrt(np.einsum('i,aij,j->a', context, A_inv, context))
+        return theta @ context + self.alpha * bonus
+
+    def choose_action(self, state):
+        actions = self.get_actions(state)
+
+        if not actions:
+            print(f"[WARNING] No actions defined for state: {state}")
+            return None
+
+        context = self.context_builder.build(state)
+        action = actions[int(np.argmax(self.scores(context, actions)))]
+        self.pending[(state, action)] = context
+        return action
+
+    def update(self, state, action, reward):
+        context = self.pending.pop((state, action), None)
+        if context is None:
+            context = self.context_builder.build(state)
+        self.update_batch(context[None, :], [action], [reward])
+
+    def human_update(self, state, action, feedback):
+        self.update(state, action, feedback)
+
+    def update_batch(self, contexts, actions, rewards):
+        """Apply many (context, action, reward) observations at once"""
+        contexts = np.asarray(contexts, dtype=float)
+        idx = np.array([self.actions.index(a) for a in actions])
+        np.add.at(self.A, idx, np.einsum('ni,nj->nij', contexts, contexts))
+        np.add.at(self.b, idx, contexts * np.asarray(rewards, dtype=float)[:, None])
+        self.save()
+
+if __name__ == "__main__":
+    agent = ContextualAgent()
+
+    test_state = "connection_failed"
+    start = time.perf_counter()
+    action = agent.choose_action(test_state)
+    print("Selected Action:", action, f"({(time.perf_counter() - start) * 1000:.2f}ms)")
+
+    # Fake reward
+    agent.update(test_state, action, reward=1)
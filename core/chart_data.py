@@ -0,0 +1,100 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from core.log_query import LogQueryEngine
+
+def lttb(xs, ys, threshold):
+    """Largest-Triangle-Three-Buckets downsampling to at most `threshold` points.
+
+    Keeps the first and last point and, from each bucket in between, the
+    point forming the largest triangle with its neighbours, which preserves
+    the visual shape (spikes included) of a line chart.
+    """
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    n = len(xs)
+    if threshold >= n or threshold < 3:
+        return xs, ys
+
+    edges = np.linspace(1, n - 1, threshold - 1).astype(int)
+    selected = np.empty(threshold, dtype=int)
+    selected[0], selected[-1] = 0, n - 1
+
+    a = 0
+    for i in range(threshold - 2):
+        start, stop = edges[i], edges[i + 1]
+        # Average of the next bucket (or the last point) is the third vertex
+        next_stop = edges[i + 2] if i + 2 < len(edges) else n
+        avg_x = xs[stop:next_stop].mean()
+        avg_y = ys[stop:next_stop].mean()
+
+        bucket_x = xs[start:stop]
+        bucket_y = ys[start:stop]
+        areas = np.abs((xs[a] - avg_x) * (bucket_y - ys[a]) - (xs[a] - bucket_x) * (avg_y - ys[a]))
+        a = start + int(areas.argmax())
+        selected[i + 1] = a
+
+    return xs[selected], ys[selected]
+
+def minmax_buckets(xs, ys, buckets):
+    """Keep the min and max point of each of `buckets` equal-count buckets"""
+    xs = np.asarray(xs, dtype=float)
+    ys = np.asarray(ys, dtype=float)
+    if 2 * buckets >= len(xs) or buckets < 1:
+        return xs, ys
+
+    selected = []
+    for chunk in np.array_split(np.arange(len(xs)), buckets):
+        low, high = chunk[ys[chunk].argmin()], chunk[ys[chunk].argmax()]
+        selected.extend(sorted({low, high}))
+    selected = np.array(selected)
+    return xs[selected], ys[selected]
+
+DOWNSAMPLERS = {
+    'lttb': lttb,
+    'minmax': lambda xs, ys, points: minmax_buckets(xs, ys, points // 2)
+}
+
+class ChartDataService:
+    """Chart-ready, downsampled series for arbitrary time ranges.
+
+    Rows come from the incremental LogQueryEngine indexes, so only the
+    requested window is read, and at most `target_points` points per series
+    are handed to the chart.
+    """
+
+    def __init__(self, engine=None, target_points=500):
+        self.engine = engine or LogQueryEngine()
+        self.target_points = target_points
+
+    def series(self, log_name, column, start=None, end=None, method='lttb', target_points=None, **filters):
+        """(timestamps, values) for a numeric column, downsampled to target_points"""
+        times, values = [], []
+        for row in self.engine.index(log_name).query(start, end, **filters):
+            try:
+                value = float(row.get(column, ''))
+            except ValueError:
+                continue
+            times.append(row['timestamp'])
+            values.append(value)
+
+        if not times:
+            return [], []
+
+        epoch = np.array(times, dtype='datetime64[us]').astype('int64') / 1e6
+        xs, ys = DOWNSAMPLERS[method](epoch, values, target_points or self.target_points)
+        timestamps = (xs * 1e6).astype('int64').astype('datetime64[us]')
+        return timestamps.tolist(), ys.tolist()
+
+    def issue_distribution(self, start=None, end=None):
+        """{alert_type: count}, answered from the issue log's posting lists"""
+        return self.engine.index('issues').counts_by('alert_type', start, end)
+
+def window_start(window):
+    """ISO start timestamp for a named window such as '1h', '24h' or '7d' (None for 'all')"""
+    units = {'h': 'hours', 'd': 'days'}
+    if not window or window == 'all':
+        return None
+    delta = timedelta(**{units[window[-1]]: int(window[:-1])})
+    return (datetime.now() - delta).isoformat()
@@ -1,5 +1,7 @@
+import copy
 import json
 import os
+import threading
 
 # Try to load dotenv if available
 try:
@@ -8,6 +10,23 @@ try:
 except ImportError:
     pass  # Continue without dotenv
 
+_profiles_cache = {}
+_profiles_lock = threading.Lock()
+
+def _load_profiles(config_path):
+    """Parse profiles once and reuse them until the file's mtime changes"""
+    mtime = os.stat(config_path).st_mtime_ns
+    
+    with _profiles_lock:
+        cached = _profiles_cache.get(config_path)
+        if cached and cached[0] == mtime:
+            return cached[1]
+        
+        with open(config_path, 'r') as f:
+            profiles = json.load(f)
+        _profiles_cache[config_path] = (mtime, profiles)
+        return profiles
+
 def get_env_profile(env_name):
     """Load environment profile from config/env_profiles.json"""
     config_path = os.path.join("config", "env_profiles.json")
@@ -15,13 +34,12 @@ def get_env_profile(env_name):
     if not os.path.exists(config_path):
         raise FileNotFoundError(f"Config file not found: {config_path}")
     
-    with open(config_path, 'r') as f:
-        profiles = json.load(f)
+    profiles = _load_profiles(config_path)
     
     if env_name not in profiles:
         raise ValueError(f"Environment '{env_name}' not found in profiles")
     
-    profile = profiles[env_name].copy()
+    profile = copy.deepcopy(profiles[env_name])
     
     # Override with environment variables if they exist
     for key, value in profile.items():
@@ -36,8 +54,7 @@ def get_all_profiles():
     """Get all available environment profiles"""
     config_path = os.path.join("config", "env_profiles.json")
     
-    with open(config_path, 'r') as f:
-        return json.load(f)
+    return copy.deepcopy(_load_profiles(config_path))
 
 def get_current_env():
     """Get current environment from ENV variable, default to 'dev'"""
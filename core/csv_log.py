@@ -0,0 +1,38 @@
+import csv
+import os
+import tempfile
+
+def ensure_csv_header(log_file, header):
+    """Create a CSV log with header, or extend an older header in place.
+
+    Logs only ever gain trailing columns, so an existing header that is a
+    prefix of the new one is rewritten and older rows simply have fewer fields.
+    The rewrite is not safe against concurrent writers: upgrade shared logs
+    once, before the processes that append to them start.
+    """
+    directory = os.path.dirname(log_file)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    
+    if not os.path.exists(log_file) or os.path.getsize(log_file) == 0:
+        with open(log_file, 'w', newline='') as f:
+            csv.writer(f).writerow(header)
+        return
+    
+    with open(log_file, 'r', newline='') as f:
+        current = next(csv.reader(f), [])
+        if current[:len(header)] == header or header[:len(current)] != current:
+            return
+        rows = f.read()
+    
+    # A unique temp file in the same directory, so concurrent upgrades never share one
+    fd, tmp_file = tempfile.mkstemp(prefix=os.path.basename(log_file) + '.', suffix='.tmp',
+                                    dir=directory or '.')
+    try:
+        with os.fdopen(fd, 'w', newline='') as f:
+            csv.writer(f).writerow(header)
+            f.write(rows)
+        os.replace(tmp_file, log_file)
+    except BaseException:
+        os.unlink(tmp_file)
+        raise
@@ -0,0 +1,52 @@
+import json
+import os
+import socket
+
+DEFAULT_SOCKET_PATH = os.path.join("logs", "agent_daemon.sock")
+
+class DaemonUnavailable(ConnectionError):
+    """Nothing accepted the connection; the command was never sent"""
+
+class DaemonRequestError(RuntimeError):
+    """The command was sent but no valid reply came back; it may still be running"""
+
+def get_socket_path(socket_path=None):
+    """Resolve the daemon socket path from argument, AGENT_DAEMON_SOCKET or default"""
+    return socket_path or os.getenv('AGENT_DAEMON_SOCKET', DEFAULT_SOCKET_PATH)
+
+def daemon_available(socket_path=None):
+    """Return True if a daemon socket file exists (it may still be stale)"""
+    return os.path.exists(get_socket_path(socket_path))
+
+def send_command(command, socket_path=None, timeout=120, **params):
+    """Send a single command to the agent daemon and return its JSON reply.
+
+    Raises DaemonUnavailable if the daemon could not be reached, so callers
+    can fall back to running the agent in-process. Once the command has been
+    sent, failures raise DaemonRequestError instead: the daemon may still be
+    doing the work, so it must not be run a second time.
+    """
+    request = dict(params, command=command)
+    payload = (json.dumps(request) + "\n").encode()
+
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        try:
+            sock.connect(get_socket_path(socket_path))
+        except OSError as e:
+            raise DaemonUnavailable(f"Agent daemon not reachable: {e}") from e
+
+        try:
+            sock.sendall(payload)
+            with sock.makefile('rb') as reader:
+                line = reader.readline()
+        except OSError as e:
+            raise DaemonRequestError(f"No reply from agent daemon for '{command}': {e}") from e
+
+    if not line:
+        raise DaemonRequestError(f"Agent daemon closed the connection without a reply to '{command}'")
+
+    try:
+        return json.loads(line)
+    except ValueError as e:
+        raise DaemonRequestError(f"Invalid reply from agent daemon: {e}") from e
@@ -0,0 +1,153 @@
+import argparse
+import csv
+import glob
+import mmap
+import os
+import struct
+from datetime import datetime
+
+import numpy as np
+
+MAGIC = b'HLTHREC1'
+
+# timestamp (epoch s), http_code, status (1=UP), pad, response_time_ms, then the
+# dns/connect/tls/ttfb/transfer phases in ms: 36 bytes per record vs ~65 in CSV.
+RECORD = struct.Struct('<dHBxI5f')
+RECORD_DTYPE = np.dtype([
+    ('timestamp', '<f8'),
+    ('http_code', '<u2'),
+    ('status', 'u1'),
+    ('_pad', 'u1'),
+    ('response_time_ms', '<u4'),
+    ('dns_ms', '<f4'),
+    ('connect_ms', '<f4'),
+    ('tls_ms', '<f4'),
+    ('ttfb_ms', '<f4'),
+    ('transfer_ms', '<f4')
+])
+PHASES = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'transfer_ms')
+
+def _number(value):
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+def pack_result(result, timestamp=None):
+    """Pack a health check result dict into one fixed-width record"""
+    return RECORD.pack(
+        timestamp if timestamp is not None else datetime.now().timestamp(),
+        int(_number(result.get('http_code'))),
+        1 if result.get('status') == 'UP' else 0,
+        int(_number(result.get('response_time_ms'))),
+        *(_number(result.get(phase)) for phase in PHASES)
+    )
+
+class HealthRecordWriter:
+    """Appends packed records, flushing to disk every `batch_size` results"""
+
+    def __init__(self, path, batch_size=1):
+        self.path = path
+        self.batch_size = batch_size
+        self._pending = []
+        if not os.path.exists(path) or os.path.getsize(path) == 0:
+            with open(path, 'wb') as f:
+                f.write(MAGIC)
+
+    def append(self, result, timestamp=None):
+        self._pending.append(pack_result(result, timestamp))
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def flush(self):
+        if not self._pending:
+            return
+        with open(self.path, 'ab') as f:
+            f.write(b''.join(self._pending))
+        self._pending = []
+
+def read_records(path):
+    """Zero-copy view of a record file as a numpy structured array.
+
+    The array is backed by a read-only mmap of the file, so columns such as
+    records['response_time_ms'] are computed on without parsing or copying.
+    """
+    size = os.path.getsize(path)
+    if size <= len(MAGIC):
+        return np.empty(0, dtype=RECORD_DTYPE)
+
+    with open(path, 'rb') as f:
+        mapped = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    if mapped[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"Not a health record file: {path}")
+
+    count = (size - len(MAGIC)) // RECORD.size
+    return np.frombuffer(mapped, dtype=RECORD_DTYPE, count=count, offset=len(MAGIC))
+
+def convert_csv(csv_path, bin_path=None, chunk_size=4096):
+    """Migrate a logs/health_<env>.csv file to the binary format; returns rows converted.
+
+    Records already in bin_path that are newer than the last CSV row (written
+    while the agent logged in binary only) are kept after the converted rows.
+    """
+    bin_path = bin_path or os.path.splitext(csv_path)[0] + '.bin'
+    tmp_path = bin_path + '.tmp'
+    converted = 0
+    last_timestamp = float('-inf')
+
+    with open(csv_path, 'r', newline='') as src, open(tmp_path, 'wb') as dst:
+        dst.write(MAGIC)
+        chunk = []
+        for row in csv.DictReader(src):
+            try:
+                timestamp = datetime.fromisoformat(row['timestamp']).timestamp()
+            except (KeyError, TypeError, ValueError):
+                continue  # skip partial or malformed rows
+            chunk.append(pack_result(row, timestamp))
+            last_timestamp = max(last_timestamp, timestamp)
+            if len(chunk) >= chunk_size:
+                dst.write(b''.join(chunk))
+                converted += len(chunk)
+                chunk = []
+        dst.write(b''.join(chunk))
+        converted += len(chunk)
+
+        if os.path.exists(bin_path):
+            existing = read_records(bin_path)
+            dst.write(existing[existing['timestamp'] > last_timestamp].tobytes())
+
+    os.replace(tmp_path, bin_path)
+    return converted
+
+def main():
+    parser = argparse.ArgumentParser(description='Binary health check records: convert and inspect')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    convert_parser = subparsers.add_parser('convert', help='Convert logs/health_*.csv to .bin files')
+    convert_parser.add_argument('--env', help='Only convert this environment')
+
+    dump_parser = subparsers.add_parser('dump', help='Print the last records of a .bin file')
+    dump_parser.add_argument('path')
+    dump_parser.add_argument('--tail', type=int, default=10)
+
+    args = parser.parse_args()
+
+    if args.command == 'convert':
+        pattern = f"logs/health_{args.env}.csv" if args.env else "logs/health_*.csv"
+        for csv_path in sorted(glob.glob(pattern)):
+            count = convert_csv(csv_path)
+            bin_path = os.path.splitext(csv_path)[0] + '.bin'
+            print(f"{csv_path} -> {bin_path}: {count} records "
+                  f"({os.path.getsize(csv_path)} -> {os.path.getsize(bin_path)} bytes)")
+    else:
+        records = read_records(args.path)
+        for record in records[-args.tail:]:
+            print(f"{datetime.fromtimestamp(record['timestamp']).isoformat()} "
+                  f"{'UP' if record['status'] else 'DOWN'} HTTP {record['http_code']} "
+                  f"{record['response_time_ms']}ms "
+                  + " ".join(f"{phase}={record[phase]:.1f}" for phase in PHASES))
+        print(f"{len(records)} records, mean response {records['response_time_ms'].mean():.1f}ms"
+              if len(records) else "No records")
+
+if __name__ == "__main__":
+    main()
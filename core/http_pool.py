@@ -0,0 +1,156 @@
+import os
+import socket
+import threading
+import time
+from urllib.parse import urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+from urllib3.exceptions import ConnectTimeoutError, NewConnectionError
+from urllib3.util.connection import allowed_gai_family
+
+# Per-thread connection timings, written by the connection classes below
+_timing = threading.local()
+
+class _TimedConnectionMixin:
+    """Records DNS, TCP connect and TLS setup times (all zero on keep-alive reuse)"""
+    
+    def _new_conn(self):
+        dns_host = self._dns_host
+        start = time.perf_counter()
+        try:
+            infos = socket.getaddrinfo(dns_host, self.port, allowed_gai_family(), socket.SOCK_STREAM)
+            addresses = list(dict.fromkeys(info[4][0] for info in infos))
+        except socket.gaierror:
+            addresses = [dns_host]  # let urllib3 raise its own resolution error
+        resolved = time.perf_counter()
+        _timing.dns_ms = (resolved - start) * 1000
+        
+        # Connect to the addresses we just resolved so the lookup is not repeated,
+        # trying each in turn like urllib3 does (e.g. ::1, then 127.0.0.1 for
+        # localhost); self.host (used for SNI and certificate checks) is left untouched.
+        try:
+            for i, address in enumerate(addresses):
+                self._dns_host = address
+                try:
+                    return super()._new_conn()
+                except (NewConnectionError, ConnectTimeoutError):
+                    if i == len(addresses) - 1:
+                        raise
+        finally:
+            self._dns_host = dns_host
+            _timing.tcp_ms = (time.perf_counter() - resolved) * 1000
+    
+    def connect(self):
+        start = time.perf_counter()
+        try:
+            super().connect()
+        finally:
+            _timing.setup_ms = (time.perf_counter() - start) * 1000
+
+class _TimedHTTPConnection(_TimedConnectionMixin, HTTPConnection):
+    pass
+
+class _TimedHTTPSConnection(_TimedConnectionMixin, HTTPSConnection):
+    pass
+
+class _TimedHTTPConnectionPool(HTTPConnectionPool):
+    ConnectionCls = _TimedHTTPConnection
+
+class _TimedHTTPSConnectionPool(HTTPSConnectionPool):
+    ConnectionCls = _TimedHTTPSConnection
+
+class _TimedAdapter(HTTPAdapter):
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        self.poolmanager.pool_classes_by_scheme = {
+            'http': _TimedHTTPConnectionPool,
+            'https': _TimedHTTPSConnectionPool
+        }
+
+class SessionPool:
+    """Keep-alive HTTP sessions, one per scheme://host, with idle eviction"""
+    
+    def __init__(self, pool_connections=None, pool_maxsize=None, idle_timeout=None):
+        self.pool_connections = pool_connections or int(os.getenv('HTTP_POOL_CONNECTIONS', 4))
+        self.pool_maxsize = pool_maxsize or int(os.getenv('HTTP_POOL_MAXSIZE', 10))
+        self.idle_timeout = idle_timeout or float(os.getenv('HTTP_POOL_IDLE_TIMEOUT', 300))
+        self._sessions = {}
+        self._lock = threading.Lock()
+    
+    def session_for(self, url):
+        """Return the pooled session for the URL's host, creating it if needed"""
+        parts = urlsplit(url)
+        key = f"{parts.scheme}://{parts.netloc}"
+        now = time.monotonic()
+        
+        with self._lock:
+            self._evict_idle(now)
+            entry = self._sessions.get(key)
+            if entry is None:
+                entry = [self._new_session(), now]
+                self._sessions[key] = entry
+            entry[1] = now
+            return entry[0]
+    
+    def get(self, url, timeout=10, **kwargs):
+        """GET url over a pooled connection, returning (response, timing).
+
+        timing holds dns_ms, connect_ms and tls_ms (all 0 when a kept-alive
+        connection was reused), ttfb_ms and transfer_ms, so app latency can be
+        told apart from connection setup.
+        """
+        session = self.session_for(url)
+        _timing.dns_ms = _timing.tcp_ms = _timing.setup_ms = 0.0
+        
+        start = time.perf_counter()
+        response = session.get(url, timeout=timeout, stream=True, **kwargs)
+        headers_at = time.perf_counter()
+        response.content  # read the body and release the connection to the pool
+        end = time.perf_counter()
+        
+        setup_ms = _timing.setup_ms
+        timing = {
+            'dns_ms': round(_timing.dns_ms, 1),
+            'connect_ms': round(_timing.tcp_ms, 1),
+            'tls_ms': round(max(setup_ms - _timing.dns_ms - _timing.tcp_ms, 0.0), 1),
+            'ttfb_ms': round(max((headers_at - start) * 1000 - setup_ms, 0.0), 1),
+            'transfer_ms': round((end - headers_at) * 1000, 1)
+        }
+        return response, timing
+    
+    def evict_idle(self):
+        with self._lock:
+            self._evict_idle(time.monotonic())
+    
+    def close(self):
+        with self._lock:
+            for session, _ in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+    
+    def _evict_idle(self, now):
+        for key, (session, last_used) in list(self._sessions.items()):
+            if now - last_used > self.idle_timeout:
+                session.close()
+                del self._sessions[key]
+    
+    def _new_session(self):
+        session = requests.Session()
+        adapter = _TimedAdapter(pool_connections=self.pool_connections, pool_maxsize=self.pool_maxsize)
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+
+_default_pool = None
+_default_pool_lock = threading.Lock()
+
+def get_session_pool():
+    """Process-wide SessionPool shared by all probes"""
+    global _default_pool
+    with _default_pool_lock:
+        if _default_pool is None:
+            _default_pool = SessionPool()
+        return _default_pool
@@ -0,0 +1,26 @@
+import os
+
+from core.log_query import LOG_SOURCES
+
+class LogChangeNotifier:
+    """File-change notifier over the agents' append-only logs.
+
+    Agents publish simply by appending to their logs; subscribers compare a
+    cheap stat()-based version per topic instead of re-reading files, and
+    only refresh the views whose topics changed.
+    """
+
+    def __init__(self, topics=None):
+        self.topics = topics or {name: [path] for name, (path, _) in LOG_SOURCES.items()}
+
+    def version(self, *topics):
+        """Opaque version of the given topics; it changes whenever one of their files does"""
+        signature = []
+        for topic in topics:
+            for path in self.topics[topic]:
+                try:
+                    stat = os.stat(path)
+                    signature.append((stat.st_size, stat.st_mtime_ns))
+                except FileNotFoundError:
+                    signature.append(None)
+        return tuple(signature)
@@ -0,0 +1,285 @@
+import argparse
+import bisect
+import csv
+import json
+import os
+import threading
+from datetime import datetime, timedelta
+
+# Append-only agent logs and the columns worth a per-value index
+LOG_SOURCES = {
+    'deployments': ("logs/deployment_log.csv", ['env', 'action', 'status']),
+    'monitor': ("logs/monitor_log.csv", ['status', 'target']),
+    'issues': ("logs/issue_log.csv", ['alert_type', 'target']),
+    'healing': ("logs/healing_log.csv", ['issue_type', 'action']),
+    'mttr': ("logs/mttr_log.csv", ['env', 'action', 'recovered']),
+    'health_dev': ("logs/health_dev.csv", ['status']),
+    'health_staging': ("logs/health_staging.csv", ['status']),
+    'health_cloud': ("logs/health_cloud.csv", ['status'])
+}
+
+def _read_record(f):
+    """Read one CSV record, following quoted fields that span lines"""
+    line = f.readline()
+    while line.count(b'"') % 2:
+        more = f.readline()
+        if not more:
+            break
+        line += more
+    return line
+
+class LogIndex:
+    """Incremental index over one append-only CSV log with ISO timestamps.
+
+    Keeps a sparse time index (timestamp and byte offset of every `stride`-th
+    row) plus, for each key column, per-value lists of timestamps and row
+    offsets. ISO timestamps sort as strings, so range lookups are plain
+    bisects; only rows that match are read back from disk.
+    """
+
+    def __init__(self, path, key_columns=(), stride=256):
+        self.path = path
+        self.key_columns = list(key_columns)
+        self.stride = stride
+        self._lock = threading.Lock()
+        self._reset()
+
+    def _reset(self):
+        self.header = []
+        self._header_line = b''
+        self.indexed_size = 0
+        self.row_count = 0
+        self.last_offset = None
+        self.sparse_times = []
+        self.sparse_offsets = []
+        self.postings = {column: {} for column in self.key_columns}
+
+    def refresh(self):
+        """Index rows appended since the last refresh (rebuilds if the file was rewritten)"""
+        with self._lock:
+            if not os.path.exists(self.path):
+                self._reset()
+                return
+
+            size = os.path.getsize(self.path)
+            with open(self.path, 'rb') as f:
+                if size < self.indexed_size or f.read(len(self._header_line)) != self._header_line:
+                    self._reset()
+                if self.indexed_size == 0:
+                    f.seek(0)
+                    self._header_line = _read_record(f)
+                    self.header = next(csv.reader([self._header_line.decode()]), [])
+                    self.indexed_size = f.tell()
+                self._index_from(f)
+
+    def _index_from(self, f):
+        f.seek(self.indexed_size)
+        key_positions = [(column, self.header.index(column)) for column in self.key_columns
+                         if column in self.header]
+
+        while True:
+            offset = f.tell()
+            line = _read_record(f)
+            if not line.endswith(b'\n'):
+                break  # partial row still being written; pick it up next time
+            values = next(csv.reader([line.decode()]), [])
+            if not values:
+                self.indexed_size = f.tell()
+                continue
+
+            timestamp = values[0]
+            if self.row_count % self.stride == 0:
+                self.sparse_times.append(timestamp)
+                self.sparse_offsets.append(offset)
+
+            for column, position in key_positions:
+                if position < len(values):
+                    times, offsets = self.postings[column].setdefault(values[position], ([], []))
+                    times.append(timestamp)
+                    offsets.append(offset)
+
+            self.row_count += 1
+            self.last_offset = offset
+            self.indexed_size = f.tell()
+
+    def query(self, start=None, end=None, **filters):
+        """Rows with start <= timestamp < end matching every column=value filter"""
+        self.refresh()
+        if not self.header:
+            return
+        candidates = self._candidate_offsets(start, end, filters)
+
+        with open(self.path, 'rb') as f:
+            if candidates is not None:
+                for offset in candidates:
+                    f.seek(offset)
+                    row = self._parse(_read_record(f))
+                    if all(row.get(column) == value for column, value in filters.items()):
+                        yield row
+                return
+
+            f.seek(self._start_offset(start))
+            while f.tell() < self.indexed_size:
+                row = self._parse(_read_record(f))
+                if not row:
+                    continue
+                timestamp = row.get('timestamp', '')
+                if end is not None and timestamp >= end:
+                    return
+                if (start is None or timestamp >= start) and \
+                        all(row.get(column) == value for column, value in filters.items()):
+                    yield row
+
+    def latest(self):
+        """Most recent row, or None for an empty log"""
+        self.refresh()
+        if self.last_offset is None:
+            return None
+        with open(self.path, 'rb') as f:
+            f.seek(self.last_offset)
+            return self._parse(_read_record(f))
+
+    def tail(self, n, **filters):
+        """Last n rows (oldest first) matching every column=value filter"""
+        self.refresh()
+        if not self.header or n <= 0:
+            return []
+        candidates = self._candidate_offsets(None, None, filters)
+        rows = []
+
+        with open(self.path, 'rb') as f:
+            if candidates is not None:
+                for offset in reversed(candidates):
+                    f.seek(offset)
+                    row = self._parse(_read_record(f))
+                    if all(row.get(column) == value for column, value in filters.items()):
+                        rows.append(row)
+                        if len(rows) == n:
+                            break
+                return rows[::-1]
+
+            # Scan back from the sparse index, one stride at a time, until n rows match
+            stop = self.indexed_size
+            for position in range(len(self.sparse_offsets) - 1, -1, -1):
+                f.seek(self.sparse_offsets[position])
+                chunk = []
+                while f.tell() < stop:
+                    row = self._parse(_read_record(f))
+                    if row and all(row.get(column) == value for column, value in filters.items()):
+                        chunk.append(row)
+                rows = chunk + rows
+                if len(rows) >= n:
+                    break
+                stop = self.sparse_offsets[position]
+        return rows[-n:]
+
+    def count(self, start=None, end=None, **filters):
+        """Count matching rows; a single indexed filter is answered from the index alone"""
+        self.refresh()
+        indexed = [column for column in filters if column in self.postings]
+        if len(filters) == 1 and indexed:
+            column = indexed[0]
+            times, _ = self.postings[column].get(filters[column], ([], []))
+            low, high = self._range(times, start, end)
+            return high - low
+        return sum(1 for _ in self.query(start, end, **filters))
+
+    def counts_by(self, column, start=None, end=None):
+        """{value: count} for an indexed column within the time range"""
+        self.refresh()
+        counts = {}
+        for value, (times, _) in self.postings.get(column, {}).items():
+            low, high = self._range(times, start, end)
+            if high > low:
+                counts[value] = high - low
+        return counts
+
+    def _candidate_offsets(self, start, end, filters):
+        """Offsets from the smallest matching posting list, None if no filter is indexed"""
+        best = None
+        for column, value in filters.items():
+            if column not in self.postings:
+                continue
+            times, offsets = self.postings[column].get(value, ([], []))
+            low, high = self._range(times, start, end)
+            if best is None or high - low < len(best):
+                best = offsets[low:high]
+        return best
+
+    def _start_offset(self, start):
+        if start is None or not self.sparse_times:
+            return self.sparse_offsets[0] if self.sparse_offsets else self.indexed_size
+        # Last sparse entry strictly before start; rows in between are skipped by the scan
+        position = max(bisect.bisect_left(self.sparse_times, start) - 1, 0)
+        return self.sparse_offsets[position]
+
+    @staticmethod
+    def _range(times, start, end):
+        low = bisect.bisect_left(times, start) if start is not None else 0
+        high = bisect.bisect_left(times, end) if end is not None else len(times)
+        return low, high
+
+    def _parse(self, line):
+        values = next(csv.reader([line.decode()]), [])
+        return dict(zip(self.header, values))
+
+class LogQueryEngine:
+    """Named LogIndexes over the agents' logs, refreshed incrementally per query"""
+
+    def __init__(self, sources=None):
+        sources = sources or LOG_SOURCES
+        self.indexes = {name: LogIndex(path, keys) for name, (path, keys) in sources.items()}
+
+    def index(self, log_name):
+        if log_name not in self.indexes:
+            raise ValueError(f"Unknown log '{log_name}', expected one of {sorted(self.indexes)}")
+        return self.indexes[log_name]
+
+    def query(self, log_name, start=None, end=None, **filters):
+        return list(self.index(log_name).query(start, end, **filters))
+
+    def count(self, log_name, start=None, end=None, **filters):
+        return self.index(log_name).count(start, end, **filters)
+
+    def issues_with_healing(self, start=None, end=None, window_s=300):
+        """Each issue in range paired with the healing actions for its type within window_s after it"""
+        healing = self.index('healing')
+        healing.refresh()
+        results = []
+
+        for issue in self.index('issues').query(start, end):
+            issue_time = issue['timestamp']
+            window_end = (datetime.fromisoformat(issue_time) + timedelta(seconds=window_s)).isoformat()
+            actions = list(healing.query(issue_time, window_end, issue_type=issue['alert_type']))
+            results.append(dict(issue, healing=actions))
+        return results
+
+def main():
+    parser = argparse.ArgumentParser(description='Query agent logs by time range and indexed fields')
+    parser.add_argument('log', choices=sorted(LOG_SOURCES) + ['join'],
+                       help="Log to query, or 'join' for issues with their healing actions")
+    parser.add_argument('--start', help='Inclusive ISO timestamp, e.g. 2024-01-01T02:00')
+    parser.add_argument('--end', help='Exclusive ISO timestamp, e.g. 2024-01-01T03:00')
+    parser.add_argument('--where', action='append', default=[], metavar='COLUMN=VALUE',
+                       help='Filter on a column (repeatable)')
+    parser.add_argument('--count', action='store_true', help='Print only the number of matching rows')
+    parser.add_argument('--window', type=int, default=300,
+                       help='Seconds after an issue to look for healing actions (join only)')
+
+    args = parser.parse_args()
+    filters = dict(item.split('=', 1) for item in args.where)
+    engine = LogQueryEngine()
+
+    if args.log == 'join':
+        rows = engine.issues_with_healing(args.start, args.end, args.window)
+    elif args.count:
+        print(engine.count(args.log, args.start, args.end, **filters))
+        return
+    else:
+        rows = engine.query(args.log, args.start, args.end, **filters)
+
+    for row in rows:
+        print(json.dumps(row))
+
+if __name__ == "__main__":
+    main()
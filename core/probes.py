@@ -0,0 +1,123 @@
+import random
+from typing import NamedTuple
+
+import requests
+
+from core.http_pool import get_session_pool
+
+PHASES = ('dns_ms', 'connect_ms', 'tls_ms', 'ttfb_ms', 'transfer_ms')
+
+class ProbeRecord(NamedTuple):
+    """Compact result of one health probe, with per-phase latency in ms"""
+    status: str
+    http_code: int
+    dns_ms: float = 0.0
+    connect_ms: float = 0.0
+    tls_ms: float = 0.0
+    ttfb_ms: float = 0.0
+    transfer_ms: float = 0.0
+    failed_step: str = ''
+
+    @property
+    def response_time_ms(self):
+        """App latency: time to first byte plus body transfer"""
+        return int(self.ttfb_ms + self.transfer_ms)
+
+    def as_result(self):
+        """Result dict in the shape HealthCheckAgent logs and reports"""
+        result = self._asdict()
+        result['response_time_ms'] = self.response_time_ms
+        return result
+
+def _down(failed_step='', http_code=0, timing=None):
+    return ProbeRecord('DOWN', http_code, failed_step=failed_step, **(timing or {}))
+
+class HttpCheck:
+    """Single GET against base_url + path, UP on a 2xx (or expected) status"""
+
+    def __init__(self, base_url, spec):
+        if not base_url:
+            raise ValueError(f"Check type '{spec.get('type', 'http')}' needs a URL for this environment")
+        self.base_url = base_url.rstrip('/')
+        self.path = spec.get('path', '/')
+        self.expect_status = spec.get('expect_status')
+        self.expect_body = spec.get('expect_body')
+        self.timeout = spec.get('timeout', 10)
+
+    def run(self):
+        return self._step(self.path, self.expect_status, self.expect_body)
+
+    def _step(self, path, expect_status=None, expect_body=None):
+        try:
+            response, timing = get_session_pool().get(self.base_url + path, timeout=self.timeout)
+        except requests.exceptions.RequestException:
+            return _down(path)
+
+        if expect_status is not None:
+            ok = response.status_code == expect_status
+        else:
+            ok = 200 <= response.status_code < 300
+        if ok and expect_body is not None:
+            ok = expect_body in response.text
+
+        if not ok:
+            return _down(path, response.status_code, timing)
+        return ProbeRecord('UP', response.status_code, **timing)
+
+class ScriptCheck(HttpCheck):
+    """Ordered list of GET steps; stops at the first failing step.
+
+    Phase timings are summed across the steps that ran, so the record shows
+    where the whole script spent its time.
+    """
+
+    def __init__(self, base_url, spec):
+        super().__init__(base_url, spec)
+        self.steps = spec.get('steps') or [{'path': self.path}]
+
+    def run(self):
+        totals = dict.fromkeys(PHASES, 0.0)
+        record = None
+
+        for step in self.steps:
+            record = self._step(step.get('path', '/'), step.get('expect_status'), step.get('expect_body'))
+            for phase in PHASES:
+                totals[phase] += getattr(record, phase)
+            if record.status != 'UP':
+                break
+
+        totals = {phase: round(value, 1) for phase, value in totals.items()}
+        return record._replace(**totals)
+
+class SimulatedCheck:
+    """Simulated check for targets without a reachable URL (e.g. the Render stub)"""
+
+    def __init__(self, base_url, spec):
+        self.uptime = spec.get('uptime', 0.75)
+
+    def run(self):
+        is_up = random.random() < self.uptime
+        return ProbeRecord('UP' if is_up else 'DOWN', 200 if is_up else 503,
+                           ttfb_ms=float(random.randint(100, 500)))
+
+CHECK_TYPES = {
+    'http': HttpCheck,
+    'script': ScriptCheck,
+    'simulated': SimulatedCheck
+}
+
+def register_check_type(name, check_class):
+    """Register a custom check type usable as profile['check']['type']"""
+    CHECK_TYPES[name] = check_class
+
+def build_check(spec, base_url=None):
+    """Create a check from a profile's 'check' entry (a dict or just a type name)"""
+    if isinstance(spec, str):
+        spec = {'type': spec}
+    spec = spec or {'type': 'http' if base_url else 'simulated'}
+
+    check_type = spec.get('type', 'http')
+    if check_type not in CHECK_TYPES:
+        raise ValueError(f"Unknown check type: {check_type}")
+
+    return CHECK_TYPES[check_type](base_url, spec)
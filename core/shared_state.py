@@ -0,0 +1,123 @@
+import csv
+import itertools
+import queue
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+
+class RingBuffer:
+    """Fixed-capacity buffer of the most recent items; oldest entries drop off"""
+
+    def __init__(self, capacity):
+        self._items = deque(maxlen=capacity)
+        self._lock = threading.Lock()
+
+    def append(self, item):
+        with self._lock:
+            self._items.append(item)
+
+    def items(self):
+        """Copy of the buffered items, oldest first"""
+        with self._lock:
+            return list(self._items)
+
+    def latest(self):
+        with self._lock:
+            return self._items[-1] if self._items else None
+
+    def __len__(self):
+        return len(self._items)
+
+class SharedState:
+    """In-memory hand-off between the monitor and autofix threads.
+
+    Writers append samples/incidents to ring buffers and publish a new
+    read-only snapshot by swapping a single reference, so readers call
+    snapshot() without locking and never see a half-updated state.
+    """
+
+    def __init__(self, sample_capacity=1000, incident_capacity=200):
+        self.samples = RingBuffer(sample_capacity)
+        self.incidents = RingBuffer(incident_capacity)
+        self._seq = itertools.count(1)
+        self._write_lock = threading.Lock()
+        self._snapshot = MappingProxyType({'status': 'unknown', 'last_sample': None,
+                                           'last_incident': None, 'updated_at': None})
+
+    def snapshot(self):
+        """Current state mapping (read-only; replaced wholesale on every update)"""
+        return self._snapshot
+
+    def publish_sample(self, sample):
+        self.samples.append(sample)
+        self._swap(status=sample.get('status'), last_sample=sample)
+
+    def publish_incident(self, alert_type, message, target=None):
+        """target is the probed URL when several services share one state"""
+        incident = {'seq': next(self._seq), 'timestamp': time.time(),
+                    'alert_type': alert_type, 'message': message, 'target': target}
+        self.incidents.append(incident)
+        self._swap(last_incident=incident)
+        return incident
+
+    def _swap(self, **changes):
+        with self._write_lock:
+            state = dict(self._snapshot)
+            state.update(changes, updated_at=time.time())
+            self._snapshot = MappingProxyType(state)
+
+def write_batch(batch):
+    """Append (log_file, row) pairs, opening each file once per batch"""
+    rows_by_file = {}
+    for log_file, row in batch:
+        rows_by_file.setdefault(log_file, []).append(row)
+    for log_file, rows in rows_by_file.items():
+        try:
+            with open(log_file, 'a', newline='') as f:
+                csv.writer(f).writerows(rows)
+        except OSError as e:
+            print(f"Warning: Could not write {log_file}: {e}")
+
+class AsyncCsvWriter:
+    """Appends CSV rows from a background thread so probes never wait on disk"""
+
+    def __init__(self):
+        self._queue = queue.Queue()
+        self._thread = threading.Thread(target=self._run, name='csv-writer', daemon=True)
+        self._thread.start()
+
+    def write(self, log_file, row):
+        self._queue.put((log_file, row))
+
+    def flush(self):
+        """Block until every queued row has been written"""
+        self._queue.join()
+
+    def close(self):
+        self._queue.put(None)
+        self._thread.join()
+
+    def _run(self):
+        while True:
+            item = self._queue.get()
+            if item is None:
+                self._queue.task_done()
+                return
+
+            # Drain whatever else is queued and write it file by file
+            batch = [item]
+            while True:
+                try:
+                    extra = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if extra is None:
+                    self._queue.put(None)
+                    self._queue.task_done()
+                    break
+                batch.append(extra)
+
+            write_batch(batch)
+            for _ in batch:
+                self._queue.task_done()
@@ -3,73 +3,111 @@ import pandas as pd
 import os
 from datetime import datetime, timedelta
 import plotly.express as px
+from core.chart_data import ChartDataService, window_start
+from core.live_updates import LogChangeNotifier
+from core.log_query import LOG_SOURCES, LogQueryEngine
 
 st.set_page_config(page_title="DevOps Dashboard", layout="wide")
 
 st.title("🚀 DevOps Automation Dashboard")
 
-# Helper function to load CSV safely
-def load_csv(file_path):
-    if os.path.exists(file_path):
-        try:
-            return pd.read_csv(file_path)
-        except:
-            return pd.DataFrame()
-    return pd.DataFrame()
-
-# Load data
-deployment_df = load_csv("logs/deployment_log.csv")
-monitor_df = load_csv("logs/monitor_log.csv")
-issue_df = load_csv("logs/issue_log.csv")
-healing_df = load_csv("logs/healing_log.csv")
+@st.cache_resource
+def get_query_engine():
+    # Kept across reruns so the log indexes only ever read newly appended rows
+    return LogQueryEngine()
+
+@st.cache_resource
+def get_chart_service():
+    return ChartDataService(get_query_engine())
+
+@st.cache_resource
+def get_notifier():
+    return LogChangeNotifier()
+
+# Tables come from the incremental log indexes: only the rows shown are read from disk
+def tail_df(log_name, n, **filters):
+    return pd.DataFrame(get_query_engine().index(log_name).tail(n, **filters))
 
 # Sidebar
 st.sidebar.header("System Status")
 if st.sidebar.button("🔄 Refresh Data"):
     st.rerun()
 
-# Main dashboard
-col1, col2, col3, col4 = st.columns(4)
-
-# Deployment Status
-with col1:
-    st.metric("Total Deployments", len(deployment_df))
-    if not deployment_df.empty and 'timestamp' in deployment_df.columns:
-        last_deploy = deployment_df.iloc[-1]['timestamp']
-        st.write(f"Last: {last_deploy[:19]}")
+chart_window = st.sidebar.selectbox("Chart window", ["1h", "24h", "7d", "30d", "all"], index=1)
+chart_service = get_chart_service()
+engine = get_query_engine()
+notifier = get_notifier()
+
+# Live mode re-runs only the sections below (as fragments) once a second; each
+# section recomputes its data only when the logs it reads have changed.
+LIVE_INTERVAL = 1
+live_updates = st.sidebar.checkbox("Live updates (1s)", disabled=not hasattr(st, "fragment"))
+
+def live_section(render):
+    if live_updates:
+        return st.fragment(run_every=LIVE_INTERVAL)(render)
+    return render
+
+def live_data(key, topics, compute, params=()):
+    """Cached compute() per widget key; recomputed when the topics' logs or params change.
+
+    params (e.g. the window start) are part of the stored version, not the key,
+    so the entry is replaced rather than a new one added as the window slides.
+    """
+    version = (notifier.version(*topics), params)
+    cache = st.session_state.setdefault("live_cache", {})
+    if key not in cache or cache[key][0] != version:
+        cache[key] = (version, compute())
+    return cache[key][1]
+
+def chart_start():
+    """Start of the chart window, to the minute; live fragments call it on every run so the window slides"""
+    start = window_start(chart_window)
+    return start[:16] if start else None
 
-# Uptime Calculation
-with col2:
-    if not monitor_df.empty and 'status' in monitor_df.columns:
-        total_pings = len(monitor_df)
-        successful_pings = len(monitor_df[monitor_df['status'] == 'success'])
-        uptime = (successful_pings / total_pings * 100) if total_pings > 0 else 0
-        st.metric("Uptime %", f"{uptime:.1f}%")
-    else:
-        st.metric("Uptime %", "N/A")
-
-# Errors & Fixes
-with col3:
-    st.metric("Total Issues", len(issue_df))
+# Main dashboard
+@live_section
+def render_summary():
+    col1, col2, col3, col4 = st.columns(4)
+    
+    # Deployment Status
+    with col1:
+        deployments = engine.index('deployments')
+        last_deploy = live_data('last_deploy', ['deployments'], deployments.latest)
+        st.metric("Total Deployments", deployments.row_count)
+        if last_deploy:
+            st.write(f"Last: {last_deploy['timestamp'][:19]}")
+    
+    # Uptime Calculation
+    with col2:
+        statuses = live_data('monitor_statuses', ['monitor'], lambda: engine.index('monitor').counts_by('status'))
+        total_pings = sum(statuses.values())
+        if total_pings > 0:
+            uptime = statuses.get('success', 0) / total_pings * 100
+            st.metric("Uptime %", f"{uptime:.1f}%")
+        else:
+            st.metric("Uptime %", "N/A")
     
-with col4:
-    st.metric("Auto Fixes", len(healing_df))
+    # Errors & Fixes
+    with col3:
+        live_data('issues_count', ['issues'], engine.index('issues').refresh)
+        st.metric("Total Issues", engine.index('issues').row_count)
+        
+    with col4:
+        live_data('healing_count', ['healing'], engine.index('healing').refresh)
+        st.metric("Auto Fixes", engine.index('healing').row_count)
+
+render_summary()
 
 st.divider()
 
 # Environment Health Panel
 st.header("🏥 Environment Health Status")
 
-# Load health data
-health_dev_df = load_csv("logs/health_dev.csv")
-health_staging_df = load_csv("logs/health_staging.csv")
-health_cloud_df = load_csv("logs/health_cloud.csv")
-
-def get_env_status(health_df):
-    if health_df.empty:
+def get_env_status(latest):
+    if not latest:
         return "🔘", "No Data", 0
     
-    latest = health_df.iloc[-1]
     status = latest.get('status', 'UNKNOWN')
     response_time = latest.get('response_time_ms', 0)
     
@@ -81,54 +119,59 @@ def get_env_status(health_df):
         return "🟡", "UNKNOWN", response_time
 
 # Environment status cards
-col1, col2, col3 = st.columns(3)
-
-with col1:
-    icon, status, rt = get_env_status(health_dev_df)
-    st.metric(f"{icon} Dev Environment", status, f"{rt}ms")
-    
-with col2:
-    icon, status, rt = get_env_status(health_staging_df)
-    st.metric(f"{icon} Staging Environment", status, f"{rt}ms")
-    
-with col3:
-    icon, status, rt = get_env_status(health_cloud_df)
-    st.metric(f"{icon} Cloud Environment", status, f"{rt}ms")
+@live_section
+def render_env_status():
+    for column, env_name in zip(st.columns(3), ['Dev', 'Staging', 'Cloud']):
+        log_name = f"health_{env_name.lower()}"
+        latest = live_data(f"{log_name}_latest", [log_name], engine.index(log_name).latest)
+        with column:
+            icon, status, rt = get_env_status(latest)
+            st.metric(f"{icon} {env_name} Environment", status, f"{rt}ms")
+            if not latest and os.path.exists(f"logs/{log_name}.bin"):
+                st.caption("Checks are logged in binary only; set HEALTH_LOG_FORMAT=both to show them here")
+
+render_env_status()
 
 # Health Trends
-st.subheader("📈 Health Trends (Last 20 Checks)")
+st.subheader(f"📈 Health Trends ({chart_window})")
 
 col1, col2 = st.columns(2)
 
-with col1:
+@live_section
+def render_health_trends():
     st.write("**Response Times**")
-    if not health_dev_df.empty and 'response_time_ms' in health_dev_df.columns:
-        # Prepare data for plotting
-        plot_data = []
-        
-        for env_name, df in [('Dev', health_dev_df), ('Staging', health_staging_df), ('Cloud', health_cloud_df)]:
-            if not df.empty and 'response_time_ms' in df.columns:
-                env_data = df.tail(20).copy()
-                env_data['Environment'] = env_name
-                plot_data.append(env_data[['timestamp', 'response_time_ms', 'Environment']])
-        
-        if plot_data:
-            combined_data = pd.concat(plot_data, ignore_index=True)
-            fig = px.line(combined_data, x='timestamp', y='response_time_ms', 
-                         color='Environment', title="Response Times by Environment")
-            st.plotly_chart(fig, use_container_width=True)
-        else:
-            st.info("No health data available")
+    # Downsampled server-side so long windows ship a bounded number of points
+    plot_data = []
+    start = chart_start()
+    for env_name in ['Dev', 'Staging', 'Cloud']:
+        log_name = f"health_{env_name.lower()}"
+        timestamps, values = live_data(f"{log_name}_series", [log_name],
+                                       lambda: chart_service.series(log_name, 'response_time_ms', start),
+                                       params=(start,))
+        if timestamps:
+            plot_data.append(pd.DataFrame({'timestamp': timestamps, 'response_time_ms': values,
+                                           'Environment': env_name}))
+    
+    if plot_data:
+        combined_data = pd.concat(plot_data, ignore_index=True)
+        fig = px.line(combined_data, x='timestamp', y='response_time_ms', 
+                     color='Environment', title="Response Times by Environment")
+        st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No health data available")
 
+with col1:
+    render_health_trends()
+
 with col2:
     st.write("**Uptime Statistics**")
     status_data = []
-    for env_name, df in [('Dev', health_dev_df), ('Staging', health_staging_df), ('Cloud', health_cloud_df)]:
-        if not df.empty and 'status' in df.columns:
-            up_count = len(df[df['status'] == 'UP'])
-            total = len(df)
+    for env_name in ['Dev', 'Staging', 'Cloud']:
+        # Answered from the status posting lists, without reading any rows
+        statuses = engine.index(f"health_{env_name.lower()}").counts_by('status')
+        if statuses:
+            up_count = statuses.get('UP', 0)
+            total = sum(statuses.values())
             uptime = (up_count / total * 100) if total > 0 else 0
             status_data.append({
                 'Environment': env_name, 
@@ -145,32 +188,17 @@ with col2:
 # Deploy History
 st.subheader("🚀 Recent Deployments (Last 5 per Environment)")
 
-if not deployment_df.empty and 'env' in deployment_df.columns:
-    col1, col2, col3 = st.columns(3)
-    
-    with col1:
-        st.write("**Dev Deployments**")
-        dev_deploys = deployment_df[deployment_df['env'] == 'dev'].tail(5)
-        if not dev_deploys.empty:
-            st.dataframe(dev_deploys[['timestamp', 'action', 'status']], use_container_width=True)
-        else:
-            st.info("No dev deployments")
-    
-    with col2:
-        st.write("**Staging Deployments**")
-        staging_deploys = deployment_df[deployment_df['env'] == 'staging'].tail(5)
-        if not staging_deploys.empty:
-            st.dataframe(staging_deploys[['timestamp', 'action', 'status']], use_container_width=True)
-        else:
-            st.info("No staging deployments")
-    
-    with col3:
-        st.write("**Cloud Deployments**")
-        cloud_deploys = deployment_df[deployment_df['env'] == 'cloud'].tail(5)
-        if not cloud_deploys.empty:
-            st.dataframe(cloud_deploys[['timestamp', 'action', 'status']], use_container_width=True)
-        else:
-            st.info("No cloud deployments")
+deployments = engine.index('deployments')
+deployments.refresh()
+if deployments.row_count:
+    for column, env in zip(st.columns(3), ['dev', 'staging', 'cloud']):
+        with column:
+            st.write(f"**{env.capitalize()} Deployments**")
+            env_deploys = tail_df('deployments', 5, env=env)
+            if not env_deploys.empty:
+                st.dataframe(env_deploys[['timestamp', 'action', 'status']], use_container_width=True)
+            else:
+                st.info(f"No {env} deployments")
 else:
     st.info("No deployment data available")
 
@@ -179,62 +207,113 @@ st.divider()
 # Charts section
 col1, col2 = st.columns(2)
 
-with col1:
+@live_section
+def render_response_times():
     st.subheader("📊 Response Times")
-    if not monitor_df.empty and 'response_time' in monitor_df.columns:
-        monitor_df['response_time'] = pd.to_numeric(monitor_df['response_time'], errors='coerce')
-        fig = px.line(monitor_df.tail(50), y='response_time', 
-                     title="Last 50 Response Times (seconds)")
+    start = chart_start()
+    timestamps, values = live_data("monitor_series", ['monitor'],
+                                   lambda: chart_service.series('monitor', 'response_time', start),
+                                   params=(start,))
+    if timestamps:
+        fig = px.line(x=timestamps, y=values, labels={'x': 'timestamp', 'y': 'response_time'},
+                     title=f"Response Times ({chart_window}, seconds)")
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No monitoring data available")
 
-with col2:
+@live_section
+def render_issue_distribution():
     st.subheader("🚨 Issues Over Time")
-    if not issue_df.empty and 'alert_type' in issue_df.columns:
-        issue_counts = issue_df['alert_type'].value_counts()
-        fig = px.pie(values=issue_counts.values, names=issue_counts.index,
-                    title="Issue Types Distribution")
+    start = chart_start()
+    issue_counts = live_data("issue_distribution", ['issues'],
+                             lambda: chart_service.issue_distribution(start), params=(start,))
+    if issue_counts:
+        fig = px.pie(values=list(issue_counts.values()), names=list(issue_counts.keys()),
+                    title=f"Issue Types Distribution ({chart_window})")
         st.plotly_chart(fig, use_container_width=True)
     else:
         st.info("No issues recorded")
 
+with col1:
+    render_response_times()
+
+with col2:
+    render_issue_distribution()
+
 st.divider()
 
 # Data tables
-tab1, tab2, tab3, tab4 = st.tabs(["📋 Deployments", "📈 Monitoring", "🚨 Issues", "🔧 Healing"])
+tab1, tab2, tab3, tab4, tab5 = st.tabs(["📋 Deployments", "📈 Monitoring", "🚨 Issues", "🔧 Healing", "🔎 Investigate"])
 
 with tab1:
     st.subheader("Deployment Log")
+    deployment_df = tail_df('deployments', 20)
     if not deployment_df.empty:
-        st.dataframe(deployment_df.tail(20), use_container_width=True)
+        st.dataframe(deployment_df, use_container_width=True)
     else:
         st.info("No deployment data")
 
 with tab2:
     st.subheader("Monitor Log")
+    monitor_df = tail_df('monitor', 20)
     if not monitor_df.empty:
-        st.dataframe(monitor_df.tail(20), use_container_width=True)
+        st.dataframe(monitor_df, use_container_width=True)
     else:
         st.info("No monitoring data")
 
 with tab3:
     st.subheader("Issue Log")
+    issue_df = tail_df('issues', 20)
     if not issue_df.empty:
-        st.dataframe(issue_df.tail(20), use_container_width=True)
+        st.dataframe(issue_df, use_container_width=True)
     else:
         st.info("No issues recorded")
 
 with tab4:
     st.subheader("Healing Log")
+    healing_df = tail_df('healing', 20)
     if not healing_df.empty:
-        st.dataframe(healing_df.tail(20), use_container_width=True)
+        st.dataframe(healing_df, use_container_width=True)
     else:
         st.info("No healing actions recorded")
 
-# Auto-refresh
+with tab5:
+    st.subheader("Incident Investigation")
+    engine = get_query_engine()
+    
+    col1, col2, col3 = st.columns(3)
+    with col1:
+        log_name = st.selectbox("Log", sorted(LOG_SOURCES) + ["issues + healing"])
+    with col2:
+        start_date = st.date_input("From date", datetime.now().date())
+        start_time = st.time_input("From time", (datetime.now() - timedelta(hours=1)).time())
+    with col3:
+        end_date = st.date_input("To date", datetime.now().date())
+        end_time = st.time_input("To time", datetime.now().time())
+    
+    start = datetime.combine(start_date, start_time).isoformat()
+    end = datetime.combine(end_date, end_time).isoformat()
+    
+    if log_name == "issues + healing":
+        joined = engine.issues_with_healing(start, end)
+        rows = [{**{k: v for k, v in issue.items() if k != 'healing'},
+                 'healing_actions': ", ".join(f"{h['action']} ({h['status']})" for h in issue['healing'])}
+                for issue in joined]
+    else:
+        index = engine.index(log_name)
+        filters = {}
+        for column in LOG_SOURCES[log_name][1]:
+            counts = index.counts_by(column, start, end)
+            choice = st.selectbox(f"{column}", ["(any)"] + sorted(counts), key=f"{log_name}_{column}")
+            if choice != "(any)":
+                filters[column] = choice
+        rows = engine.query(log_name, start, end, **filters)
+    
+    st.metric("Matching rows", len(rows))
+    if rows:
+        st.dataframe(pd.DataFrame(rows), use_container_width=True)
+    else:
+        st.info("No rows in the selected range")
+
 st.sidebar.markdown("---")
-if st.sidebar.checkbox("Auto-refresh (30s)"):
-    import time
-    time.sleep(30)
-    st.rerun()
\ No newline at end of file
+st.sidebar.caption("Tables refresh with 🔄; enable live updates for the status cards and charts.")
\ No newline at end of file
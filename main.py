@@ -5,6 +5,9 @@ import csv
 from agents.deploy_agent import DeployAgent
 from agents.monitor_agent import MonitorAgent
 from agents.auto_fix_agent import AutoFixAgent
+from agents.outcome_verifier import OutcomeVerifier
+from core.shared_state import AsyncCsvWriter, SharedState
+from contextual_agent import ContextBuilder, ContextualAgent
 from smart_agent import SmartAgent
 
 def deploy_cycle():
@@ -12,27 +15,77 @@ def deploy_cycle():
     deploy_agent.deploy_flask()
     print("Deployment completed")
 
-def monitor_cycle(ping_interval=30, slow_threshold=5):
-    monitor_agent = MonitorAgent(ping_interval=ping_interval, slow_threshold=slow_threshold)
+def monitor_cycle(ping_interval=30, slow_threshold=5, state=None, writer=None):
+    monitor_agent = MonitorAgent(ping_interval=ping_interval, slow_threshold=slow_threshold,
+                                 state=state, writer=writer)
     monitor_agent.start_monitoring()
 
-def autofix_cycle(check_interval=60):
-    autofix_agent = AutoFixAgent(check_interval=check_interval)
-    smart_agent = SmartAgent()
+def autofix_cycle(check_interval=60, state=None):
+    autofix_agent = AutoFixAgent(check_interval=check_interval, state=state, verify_outcomes=True)
+    smart_agent = create_policy(state, autofix_agent.env, autofix_agent.url)
+    verifier = OutcomeVerifier()
     
     while True:
-        if autofix_agent.check_issues():
-            state = get_system_state()
-            action = smart_agent.choose_action(state)
-            
-            if action:
-                success = execute_action(action, autofix_agent)
-                smart_agent.update(state, action, 1 if success else -1)
-                print(f"Smart Agent: {action} -> {'Success' if success else 'Failed'}")
-        
+        autofix_step(autofix_agent, smart_agent, state, verifier)
         time.sleep(check_interval)
 
-def get_system_state():
+def create_policy(state=None, env='local', target=None, policy=None):
+    """Remediation policy: the contextual bandit, or the per-alert Q-table"""
+    policy = policy or os.getenv('REMEDIATION_POLICY', 'bandit')
+    if policy == 'qlearning':
+        return SmartAgent()
+    return ContextualAgent(ContextBuilder(state, env, target=target))
+
+def autofix_step(autofix_agent, smart_agent, state=None, verifier=None):
+    # SmartAgent picks the remediation, so AutoFix only reports new issues;
+    # letting both act would redeploy twice per issue.
+    if autofix_agent.check_issues(auto_handle=False):
+        system_state = get_system_state(state, autofix_agent.last_issue)
+        action = smart_agent.choose_action(system_state)
+        
+        if action:
+            started_at = time.monotonic()
+            success = execute_action(action, autofix_agent)
+            # None means the remediation controller suppressed the action
+            if success is None:
+                print(f"Smart Agent: {action} -> Skipped")
+            elif verifier is None:
+                smart_agent.update(system_state, action, 1 if success else -1)
+                print(f"Smart Agent: {action} -> {'Success' if success else 'Failed'}")
+            else:
+                # Reward real recovery of the service the incident was raised for,
+                # faster recovery more, rather than the action returning
+                issue = autofix_agent.last_issue or {}
+                url = issue.get('target') or autofix_agent.url
+                if success:
+                    outcome = verifier.verify(autofix_agent.env, action, url, started_at)
+                    if outcome is None:
+                        print(f"Smart Agent: {action} -> Verification interrupted")
+                        return
+                else:
+                    outcome = verifier.failed(autofix_agent.env, action, url)
+                if outcome['recovered']:
+                    # Incidents raised while the service was still coming back are covered by this fix
+                    autofix_agent.mark_handled(outcome['recovered_at'])
+                # Redeploys went through the remediation controller, whose breaker waits for this
+                if success and action != 'monitor' and autofix_agent.verify_outcomes:
+                    autofix_agent.controller.record(autofix_agent.env, outcome['recovered'])
+                smart_agent.update(system_state, action, outcome['reward'])
+                if outcome['recovered']:
+                    print(f"Smart Agent: {action} -> Recovered in {outcome['time_to_recovery_s']:.1f}s "
+                          f"(reward {outcome['reward']:.2f})")
+                else:
+                    print(f"Smart Agent: {action} -> {'Not recovered' if success else 'Failed'}")
+
+def get_system_state(state=None, issue=None):
+    # The issue AutoFix reported, which in process mode may not be the newest incident
+    if issue is not None:
+        return issue['alert_type'].lower()
+    
+    if state is not None:
+        incident = state.snapshot()['last_incident']
+        return incident['alert_type'].lower() if incident else "healthy"
+    
     if not os.path.exists("logs/issue_log.csv"):
         return "healthy"
     
@@ -62,24 +115,34 @@ def execute_action(action, autofix_agent):
         print(f"Action execution failed: {e}")
         return False
 
-def main(monitor_interval=None, slow_threshold=None, autofix_interval=None):
+def main(monitor_interval=None, slow_threshold=None, autofix_interval=None, mode=None):
     # Dynamic configuration with defaults
     monitor_interval = monitor_interval or int(os.getenv('MONITOR_INTERVAL', 30))
     slow_threshold = slow_threshold or int(os.getenv('SLOW_THRESHOLD', 5))
     autofix_interval = autofix_interval or int(os.getenv('AUTOFIX_INTERVAL', 60))
+    mode = mode or os.getenv('RUNTIME_MODE', 'threads')
     
     print(f"Starting DevOps automation system...")
-    print(f"Config: Monitor={monitor_interval}s, Threshold={slow_threshold}s, AutoFix={autofix_interval}s")
+    print(f"Config: Monitor={monitor_interval}s, Threshold={slow_threshold}s, AutoFix={autofix_interval}s, Mode={mode}")
     
     # Initial deployment
     deploy_cycle()
     
+    if mode == 'processes':
+        from process_runtime import ProcessRuntime
+        ProcessRuntime(monitor_interval, slow_threshold, autofix_interval).run()
+        return
+    
+    # Monitor and auto-fix exchange samples/incidents in memory; CSV logs are written asynchronously
+    state = SharedState()
+    writer = AsyncCsvWriter()
+    
     # Start monitoring in background
-    monitor_thread = threading.Thread(target=lambda: monitor_cycle(monitor_interval, slow_threshold), daemon=True)
+    monitor_thread = threading.Thread(target=lambda: monitor_cycle(monitor_interval, slow_threshold, state, writer), daemon=True)
     monitor_thread.start()
     
     # Start auto-fix in background
-    autofix_thread = threading.Thread(target=lambda: autofix_cycle(autofix_interval), daemon=True)
+    autofix_thread = threading.Thread(target=lambda: autofix_cycle(autofix_interval, state), daemon=True)
     autofix_thread.start()
     
     print("System running: Deploy → Monitor → AutoFix")
@@ -88,6 +151,7 @@ def main(monitor_interval=None, slow_threshold=None, autofix_interval=None):
         while True:
             time.sleep(1)
     except KeyboardInterrupt:
+        writer.flush()
         print("\nSystem stopped")
 
 if __name__ == "__main__":
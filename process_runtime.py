@@ -0,0 +1,180 @@
+import multiprocessing as mp
+import os
+import queue
+import signal
+import time
+from agents.auto_fix_agent import AutoFixAgent
+from agents.monitor_agent import MonitorAgent
+from agents.outcome_verifier import OutcomeVerifier
+from core.shared_state import SharedState, write_batch
+
+class QueueWriter:
+    """AsyncCsvWriter stand-in that hands rows to the persistence process"""
+
+    def __init__(self, persist_queue):
+        self.persist_queue = persist_queue
+
+    def write(self, log_file, row):
+        self.persist_queue.put((log_file, row))
+
+class QueuePublisher:
+    """SharedState stand-in that forwards samples/incidents to the remediation process"""
+
+    def __init__(self, event_queue, target):
+        self.event_queue = event_queue
+        self.target = target
+
+    def publish_sample(self, sample):
+        self.event_queue.put(('sample', dict(sample, target=self.target)))
+
+    def publish_incident(self, alert_type, message):
+        self.event_queue.put(('incident', {'alert_type': alert_type, 'message': message,
+                                           'target': self.target}))
+
+def probe_worker(targets, ping_interval, slow_threshold, event_queue, persist_queue, stop_event):
+    """Probe a share of the monitored URLs until asked to stop"""
+    writer = QueueWriter(persist_queue)
+    monitors = [MonitorAgent(url=url, slow_threshold=slow_threshold, ping_interval=ping_interval,
+                             state=QueuePublisher(event_queue, url), writer=writer)
+                for url in targets]
+
+    while not stop_event.is_set():
+        for monitor in monitors:
+            monitor.ping_app()
+        stop_event.wait(ping_interval)
+
+def remediation_worker(check_interval, event_queue, stop_event):
+    """Feed incoming events into a local SharedState and run the autofix loop on it"""
+    from main import autofix_step, create_policy
+
+    state = SharedState()
+    autofix_agent = AutoFixAgent(check_interval=check_interval, state=state, verify_outcomes=True)
+    smart_agent = create_policy(state, autofix_agent.env, autofix_agent.url)
+    # Shutdown interrupts a verification in progress instead of waiting out its timeout
+    verifier = OutcomeVerifier(stop_event=stop_event)
+    next_check = time.monotonic()
+
+    while not stop_event.is_set():
+        try:
+            kind, payload = event_queue.get(timeout=1)
+            if kind == 'sample':
+                state.publish_sample(payload)
+            else:
+                state.publish_incident(payload['alert_type'], payload['message'], payload['target'])
+        except queue.Empty:
+            pass
+
+        if time.monotonic() >= next_check:
+            autofix_step(autofix_agent, smart_agent, state, verifier)
+            next_check = time.monotonic() + check_interval
+
+def persistence_worker(persist_queue):
+    """Single writer for the monitor/issue CSV logs; exits on a None sentinel"""
+    while True:
+        item = persist_queue.get()
+        batch = []
+        while item is not None:
+            batch.append(item)
+            try:
+                item = persist_queue.get_nowait()
+            except queue.Empty:
+                break
+
+        write_batch(batch)
+        if item is None:
+            return
+
+def _run_worker(target, *args):
+    # Ctrl+C reaches the whole process group; only the supervisor should react to it
+    signal.signal(signal.SIGINT, signal.SIG_IGN)
+    target(*args)
+
+class ProcessRuntime:
+    """Runs probing, remediation and persistence in supervised worker processes.
+
+    Probe workers split the monitored URLs (MONITOR_URLS, comma separated)
+    across up to PROBE_WORKERS processes. Workers that die are restarted;
+    Ctrl+C stops producers first, then drains the persistence queue.
+    """
+
+    def __init__(self, monitor_interval=30, slow_threshold=5, autofix_interval=60,
+                 targets=None, probe_workers=None):
+        self.monitor_interval = monitor_interval
+        self.slow_threshold = slow_threshold
+        self.autofix_interval = autofix_interval
+        self.targets = targets or os.getenv('MONITOR_URLS', 'http://127.0.0.1:5000').split(',')
+        self.probe_workers = min(probe_workers or int(os.getenv('PROBE_WORKERS', os.cpu_count() or 1)),
+                                 len(self.targets))
+
+        self.stop_event = mp.Event()
+        self.event_queue = mp.Queue()
+        self.persist_queue = mp.Queue()
+        self.specs = {}
+        self.processes = {}
+        self.restarts = {}
+
+    def run(self):
+        # Create or upgrade the shared log headers here, once, before any worker appends to them
+        MonitorAgent()
+        self._build_specs()
+        for name in self.specs:
+            self._start(name)
+        self._start_writer()
+
+        print(f"System running in process mode: {self.probe_workers} probe worker(s), "
+              f"{len(self.targets)} target(s)")
+        try:
+            while True:
+                self._supervise()
+                time.sleep(1)
+        except KeyboardInterrupt:
+            self.shutdown()
+            print("\nSystem stopped")
+
+    def shutdown(self, timeout=10):
+        """Stop probe and remediation workers, then flush and stop the writer"""
+        self.stop_event.set()
+        for name, process in self.processes.items():
+            if name != 'writer':
+                self._join(process, timeout)
+
+        self.persist_queue.put(None)
+        self._join(self.processes['writer'], timeout)
+
+    def _build_specs(self):
+        shares = [self.targets[i::self.probe_workers] for i in range(self.probe_workers)]
+        for i, share in enumerate(shares):
+            self.specs[f'probe-{i}'] = (probe_worker, (share, self.monitor_interval, self.slow_threshold,
+                                                       self.event_queue, self.persist_queue, self.stop_event))
+        self.specs['remediation'] = (remediation_worker, (self.autofix_interval, self.event_queue,
+                                                          self.stop_event))
+
+    def _start(self, name):
+        target, args = self.specs[name]
+        process = mp.Process(target=_run_worker, args=(target,) + args, name=name, daemon=True)
+        process.start()
+        self.processes[name] = process
+
+    def _start_writer(self):
+        # Not daemonic: it has to outlive the producers to drain the queue on shutdown
+        process = mp.Process(target=_run_worker, args=(persistence_worker, self.persist_queue), name='writer')
+        process.start()
+        self.processes['writer'] = process
+
+    def _supervise(self):
+        for name, process in list(self.processes.items()):
+            if process.is_alive() or self.stop_event.is_set():
+                continue
+            self.restarts[name] = self.restarts.get(name, 0) + 1
+            print(f"Worker {name} exited with code {process.exitcode}; restarting "
+                  f"(restart #{self.restarts[name]})")
+            if name == 'writer':
+                self._start_writer()
+            else:
+                self._start(name)
+
+    def _join(self, process, timeout):
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
@@ -7,17 +7,13 @@ import random
 RL_TABLE = "rl_table.csv"
 STATE_ACTION_FILE = "states_actions.json"
 
-class SmartAgent:
-    def __init__(self, alpha=0.6, gamma=0.0, epsilon=0.2):
-        self.alpha = alpha       # learning rate
-        self.gamma = gamma       # discount factor
-        self.epsilon = epsilon   # exploration rate
+class StateActionPolicy:
+    """Base for remediation policies: the alert state → allowed actions mapping"""
 
-        self.q_table = defaultdict(lambda: defaultdict(float))
+    def __init__(self):
         self.state_actions = self.load_state_actions()
-        self.load_q_table()
 
-    # ✅ Load state → action list from YAML
+    # ✅ Load state → action list from JSON
     def load_state_actions(self):
         if not os.path.exists(STATE_ACTION_FILE):
             # Create default state-action mapping
@@ -35,6 +31,24 @@ class SmartAgent:
         with open(STATE_ACTION_FILE, "r") as f:
             return json.load(f)
 
+    # ✅ Get action list for a state
+    def get_actions(self, state):
+        return self.state_actions["actions"].get(state, [])
+
+class SmartAgent(StateActionPolicy):
+    def __init__(self, alpha=0.6, gamma=0.0, epsilon=0.2, epsilon_decay=0.95, min_epsilon=0.01):
+        super().__init__()
+        self.alpha = alpha       # learning rate
+        self.gamma = gamma       # discount factor
+        self.epsilon = epsilon   # initial exploration rate
+        self.epsilon_decay = epsilon_decay
+        self.min_epsilon = min_epsilon
+
+        self.q_table = defaultdict(lambda: defaultdict(float))
+        # Updates per state/action, saved with the Q-values so decay survives restarts
+        self.updates = defaultdict(lambda: defaultdict(int))
+        self.load_q_table()
+
     # ✅ Load existing Q-values from CSV
     def load_q_table(self):
         if not os.path.exists(RL_TABLE):
@@ -47,6 +61,7 @@ class SmartAgent:
                 a = row["action"]
                 q = float(row["q_value"])
                 self.q_table[s][a] = q
+                self.updates[s][a] = int(row.get("updates") or 0)
 
     # ✅ Save Q-values back to CSV
     def save_q_table(self):
@@ -54,20 +69,21 @@ class SmartAgent:
             rows = []
             for s, actions in self.q_table.items():
                 for a, q in actions.items():
-                    rows.append([s, a, q])
+                    rows.append([s, a, q, self.updates[s][a]])
 
             with open(RL_TABLE, "w", newline="") as f:
                 writer = csv.writer(f)
-                writer.writerow(["state", "action", "q_value"])
+                writer.writerow(["state", "action", "q_value", "updates"])
                 writer.writerows(rows)
         except Exception as e:
             print(f"Warning: Could not save Q-table: {e}")
 
-    # ✅ Get action list for a state
-    def get_actions(self, state):
-        return self.state_actions["actions"].get(state, [])
+    # ✅ Exploration rate decays with the number of updates seen for a state
+    def epsilon_for(self, state):
+        visits = sum(self.updates[state].values())
+        return max(self.min_epsilon, self.epsilon * self.epsilon_decay ** visits)
 
-    # ✅ Choose action using epsilon-greedy
+    # ✅ Choose action using decaying epsilon-greedy
     def choose_action(self, state):
         actions = self.get_actions(state)
 
@@ -76,7 +92,7 @@ class SmartAgent:
             return None
 
         # explore
-        if random.random() < self.epsilon:
+        if random.random() < self.epsilon_for(state):
             return random.choice(actions)
 
         # exploit
@@ -87,6 +103,7 @@ class SmartAgent:
         current_q = self.q_table[state][action]
         new_q = current_q + self.alpha * (reward - current_q)
         self.q_table[state][action] = new_q
+        self.updates[state][action] += 1
         self.save_q_table()
 
     # ✅ Human feedback Q-update (manual)